@@ -1,32 +1,117 @@
 """Application factory."""
 
 import falcon
-import falcon_jsonify
 from routes import routes
-from helpers import add_routes, load_settings, get_session_factory
+from helpers import (add_routes, load_settings, get_session_factory,
+                     get_autocommit_session_factory,
+                     get_replica_session_factory, get_engine_options)
+from helpers.cache import ResponseCache
+from helpers.encoding import get_json_encoder
+from helpers.events import get_broker
+from helpers.green import is_gevent_patched, make_psycopg2_green
+from helpers.metrics import RequestMetrics
+from helpers.pagination import NEXT_CURSOR_HEADER
+from helpers.replicas import ReplicaSet
+from middleware.compression import CompressionMiddleware
+from middleware.context import ResourceContextMiddleware
 from middleware.cors import CORS
+from middleware.encoding import JSONEncoderMiddleware
+from middleware.jsonify import JSONBodyMiddleware
 from middleware.logging import ResponseLoggerMiddleware
-from middleware.sqlalchemy import SQLAlchemySessionManager
+from middleware.metrics import MetricsMiddleware
+from middleware.sqlalchemy import (SQLAlchemySessionManager,
+                                   READ_PRIMARY_HEADER)
 
 
 def create(settings_module_name=None) -> falcon.API:
     """Create and return an app instance."""
     settings = load_settings(module_name=settings_module_name)
-    session_factory = get_session_factory(settings.DATABASE_BACKEND.url)
+    if is_gevent_patched():
+        # e.g. in gevent workers: wait for the database cooperatively.
+        make_psycopg2_green()
+    engine_options = get_engine_options(settings)
+    session_factory = get_session_factory(
+        settings.DATABASE_BACKEND.url,
+        engine_options=engine_options,
+        expire_on_commit=settings.SESSION_EXPIRE_ON_COMMIT,
+        autoflush=settings.SESSION_AUTOFLUSH,
+    )
+    replica_session_factories = [
+        get_replica_session_factory(url, session_factory,
+                                    engine_options=engine_options)
+        for url in settings.DATABASE_REPLICA_URLS
+    ]
+
+    metrics = RequestMetrics()
+    for factory in [session_factory, *replica_session_factories]:
+        metrics.instrument(factory.kw['bind'])
+
+    read_session_factory = None
+    if settings.SESSION_AUTOCOMMIT_READS:
+        read_session_factory = get_autocommit_session_factory(session_factory)
+        replica_session_factories = [
+            get_autocommit_session_factory(factory)
+            for factory in replica_session_factories
+        ]
+    replicas = replica_session_factories and ReplicaSet(
+        replica_session_factories,
+        retry_after=settings.DATABASE_REPLICA_RETRY_AFTER,
+    ) or None
+
+    dumps = get_json_encoder(settings.JSON_ENCODER)
+    cache = ResponseCache(
+        max_size=settings.CACHE_ENABLED and settings.CACHE_MAX_SIZE or 0,
+        ttl=settings.CACHE_TTL,
+    )
+
+    events = get_broker(settings.EVENTS_BROKER,
+                        engine=session_factory.kw['bind'],
+                        max_subscribers=settings.EVENTS_MAX_STREAMS)
 
     cors = CORS(
         allow_all_methods=True,
         allow_all_origins=True,
-        allowed_headers=['content-type'],
+        allowed_headers=['content-type', READ_PRIMARY_HEADER],
+        exposed_headers=[NEXT_CURSOR_HEADER, 'ETag', READ_PRIMARY_HEADER],
+        max_age=settings.CORS_MAX_AGE,
+    )
+
+    session_manager = SQLAlchemySessionManager(
+        factory=session_factory,
+        read_factory=read_session_factory,
+        replicas=replicas,
+        read_your_writes=settings.DATABASE_READ_YOUR_WRITES,
+    )
+
+    compression = CompressionMiddleware(
+        min_size=settings.COMPRESSION_MIN_SIZE,
+        level=settings.COMPRESSION_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
     )
 
     middleware = [
+        MetricsMiddleware(metrics, routes=routes),
         cors.Middleware(),
-        falcon_jsonify.Middleware(help_messages=True),
-        SQLAlchemySessionManager(factory=session_factory),
+        # Before the JSON middleware, to compress the bodies they encode.
+        compression,
+        JSONBodyMiddleware(help_messages=True),
+        JSONEncoderMiddleware(dumps=dumps),
+        session_manager,
+        ResourceContextMiddleware(settings=settings,
+                                  engine=session_factory.kw['bind'],
+                                  cache=cache,
+                                  dumps=dumps,
+                                  metrics=metrics,
+                                  events=events,
+                                  session_manager=session_manager),
     ]
     if settings.LOG:
-        middleware.append(ResponseLoggerMiddleware())
+        # First, so that the logged latency includes other middleware.
+        middleware.insert(0, ResponseLoggerMiddleware(
+            structured=settings.LOG_FORMAT == 'json',
+            queued=settings.LOG_QUEUE,
+            sample_rate=settings.LOG_SAMPLE_RATE,
+        ))
 
     app = falcon.API(middleware=middleware)
     add_routes(app, routes)
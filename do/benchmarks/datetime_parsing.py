@@ -0,0 +1,42 @@
+"""Benchmark date-time parsing of task due dates.
+
+Usage (from the `do/` directory):
+
+    $ python -m benchmarks.datetime_parsing
+"""
+
+import timeit
+from datetime import datetime
+
+import click
+import dateutil.parser
+
+from utils import parse_datetime
+
+NOW = datetime(2018, 4, 3, 23, 47, 25, 525349)
+VALUES = {
+    'str(datetime)': str(NOW),
+    'isoformat': NOW.isoformat(),
+    'isoformat+tz': NOW.isoformat() + '+02:00',
+    'date': str(NOW.date()),
+}
+
+
+@click.command()
+@click.option('--number', default=20000, help='Parses per measure.')
+def main(number):
+    """Print the mean time to parse a date-time, per parser and format."""
+    parsers = {
+        'parse_datetime': parse_datetime,
+        'dateutil': dateutil.parser.parse,
+    }
+    for label, value in VALUES.items():
+        for name, parse in parsers.items():
+            seconds = min(timeit.repeat(lambda: parse(value),
+                                        number=number, repeat=3))
+            click.echo('{:<15} {:<15} {:8.2f} µs/parse'.format(
+                label, name, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
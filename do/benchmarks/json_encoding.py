@@ -0,0 +1,61 @@
+"""Benchmark JSON encoders on a large list payload.
+
+Usage (from the `do/` directory):
+
+    $ python -m benchmarks.json_encoding --tasks 1000
+"""
+
+import timeit
+from datetime import datetime, timedelta
+
+import click
+
+from helpers.encoding import ENCODER_NAMES, get_json_encoder
+
+
+def make_list_payload(n_tasks: int, raw_dates: bool=False) -> dict:
+    """Build a list detail payload with `n_tasks` tasks.
+
+    If `raw_dates` is True, due dates are left as datetime objects for the
+    encoder to handle, instead of being converted to strings beforehand.
+    """
+    now = datetime.utcnow()
+    tasks = []
+    for id in range(1, n_tasks + 1):
+        due_date = now + timedelta(hours=id)
+        tasks.append({
+            'id': id,
+            'list_id': 1,
+            'title': 'Task number {}'.format(id),
+            'due_date': due_date if raw_dates else due_date.isoformat(),
+            'completed': id % 3 == 0,
+            'priority': id % 5,
+        })
+    return {'id': 1, 'title': 'Shopping', 'archived': False, 'tasks': tasks}
+
+
+@click.command()
+@click.option('--tasks', default=1000, help='Number of tasks in the list.')
+@click.option('--number', default=200, help='Encodings per measure.')
+def main(tasks, number):
+    """Print the mean time to encode a list payload, per encoder."""
+    payloads = {
+        'str dates': make_list_payload(tasks),
+        'datetimes': make_list_payload(tasks, raw_dates=True),
+    }
+    click.echo('List with {} tasks, {} runs'.format(tasks, number))
+    for name in ENCODER_NAMES:
+        try:
+            dumps = get_json_encoder(name)
+        except ImportError:
+            click.echo('{:<8} not installed'.format(name))
+            continue
+        for label, payload in payloads.items():
+            seconds = min(timeit.repeat(lambda: dumps(payload),
+                                        number=number, repeat=3))
+            click.echo('{:<8} {:<10} {:8.1f} µs/encode'.format(
+                name, label, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,12 +3,12 @@
 
 import sys
 import os
-from subprocess import run
 
 import click
 
 from helpers import load_settings
 from helpers.db import apply_migrations, create_migrations
+from helpers.server import PROFILES, get_gunicorn_args
 from helpers.shell import success
 
 os.environ.setdefault('SETTINGS_MODULE', 'settings')
@@ -16,7 +16,7 @@ settings = load_settings()
 database = settings.DATABASE_BACKEND
 
 OK = click.style('OK', fg='green')
-GUNICORN = ['gunicorn', '--reload', 'wsgi']
+GUNICORN = ['gunicorn', 'wsgi:application']
 
 
 @click.group()
@@ -25,9 +25,14 @@ def cli():
 
 
 @cli.command()
-def start():
+@click.option('--profile', type=click.Choice(PROFILES),
+              default=settings.SERVER_PROFILE, show_default=True,
+              help='Server profile, see the SERVER_* settings.')
+def start(profile: str):
     """Start the server."""
-    run(GUNICORN)
+    args = [*GUNICORN, *get_gunicorn_args(settings, profile=profile)]
+    # Replace this process, so that Gunicorn receives signals directly.
+    os.execvp(args[0], args)
 
 
 @cli.command()
@@ -1,3 +1,5 @@
 from .settings import Settings, load_settings
 from .routing import add_routes
-from .db import get_session_factory
+from .db import (get_session_factory, get_autocommit_session_factory,
+                 get_replica_session_factory, get_engine_options)
+from .pagination import paginate, paginate_request
@@ -0,0 +1,125 @@
+"""In-process response cache.
+
+Each worker process has its own cache: writes handled by a worker only
+invalidate entries of that worker, and other workers may serve stale
+entries until they expire. Keep the TTL short when running many workers.
+
+Within a worker, a response read before a write may be rendered after the
+write invalidated the cache. Such a response is not cached: every
+invalidation bumps a generation counter, and `set()` is skipped if the
+generation changed since the read started.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Bounded LRU cache of response payloads, whose entries expire.
+
+    Keys are tuples whose first item is a namespace (e.g. `'lists'`), so
+    that all entries of a namespace can be invalidated at once.
+
+    To cache a value read from the database, get the `generation` before
+    reading it and pass it to `set()`.
+
+    Parameters
+    ----------
+    max_size : int
+        Maximum number of entries. Least recently used entries are evicted
+        first. If 0, nothing is cached.
+    ttl : float
+        Number of seconds after which entries expire.
+    """
+
+    def __init__(self, max_size: int=1024, ttl: float=5, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Bumped by every invalidation.
+        self.generation = 0
+
+    def get(self, key):
+        """Return the value cached for a key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value, generation: int=None):
+        """Cache a value.
+
+        If a `generation` is given and entries were invalidated since then,
+        the value may be stale and is not cached.
+        """
+        if not self.max_size:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *key):
+        """Remove the entry of a key, if any."""
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(key, None)
+
+    def clear(self, namespace: str=None):
+        """Remove all entries, or only those of a namespace."""
+        with self._lock:
+            self.generation += 1
+            if namespace is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == namespace]:
+                del self._entries[key]
+
+    def serve(self, key, response, render, headers=()):
+        """Set a response from the cache, or render it and cache it.
+
+        Parameters
+        ----------
+        key : tuple
+        response : falcon.Response
+        render : callable
+            Called with the response to set its `json` (and headers).
+        headers : list of str, optional
+            Response headers cached along with the JSON payload.
+        """
+        generation = self.generation
+        entry = self.get(key)
+        if entry is not None:
+            response.json, cached_headers = entry
+            response.set_headers(cached_headers)
+            return
+        render(response)
+        cached_headers = {}
+        for name in headers:
+            value = response.get_header(name)
+            if value is not None:
+                cached_headers[name] = value
+        self.set(key, (response.json, cached_headers), generation)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
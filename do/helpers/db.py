@@ -1,5 +1,7 @@
 """Database utilities."""
 
+import weakref
+
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.url import make_url
@@ -7,18 +9,80 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy_utils.functions import (create_database, database_exists,
                                         drop_database)
 
+from helpers.pool import MeteredQueuePool
 from helpers.shell import success
 from models import Base
 
 ALEMBIC_UPGRADE_HEAD = ['alembic', 'upgrade', 'head']
 ALEMBIC_GENERATE = ['alembic', 'revision', '--autogenerate']
 
+# Engines created by this module, see `dispose_engines()`.
+_engines = weakref.WeakSet()
+
+
+def get_engine_options(settings) -> dict:
+    """Build `create_engine()` options from the pool settings."""
+    return {
+        'poolclass': MeteredQueuePool,
+        'pool_size': settings.DATABASE_POOL_SIZE,
+        'max_overflow': settings.DATABASE_MAX_OVERFLOW,
+        'pool_timeout': settings.DATABASE_POOL_TIMEOUT,
+        'pool_recycle': settings.DATABASE_POOL_RECYCLE,
+        'pool_pre_ping': settings.DATABASE_POOL_PRE_PING,
+    }
+
 
-def get_session_factory(database_url: str) -> sessionmaker:
-    """Create and return a session factory."""
-    engine: Engine = create_engine(database_url)
+def get_session_factory(database_url: str, engine_options: dict=None,
+                        **options) -> sessionmaker:
+    """Create and return a session factory.
+
+    Parameters
+    ----------
+    database_url : str
+    engine_options : dict, optional
+        Passed to `create_engine()`, e.g. pool options.
+    **options : dict
+        Passed to the `sessionmaker`, e.g. `expire_on_commit`.
+    """
+    engine: Engine = create_engine(database_url, **(engine_options or {}))
+    _engines.add(engine)
     Base.metadata.bind = engine
-    return sessionmaker(bind=engine)
+    return sessionmaker(bind=engine, **options)
+
+
+def get_replica_session_factory(database_url: str, factory: sessionmaker,
+                                engine_options: dict=None) -> sessionmaker:
+    """Create a session factory bound to a read replica.
+
+    Parameters
+    ----------
+    database_url : str
+        URL of the replica.
+    factory : sessionmaker
+        Session factory of the primary, whose options are reused.
+    engine_options : dict, optional
+        Passed to `create_engine()`, e.g. pool options.
+    """
+    engine = create_engine(database_url, **(engine_options or {}))
+    _engines.add(engine)
+    return sessionmaker(**{**factory.kw, 'bind': engine})
+
+
+def get_autocommit_session_factory(factory: sessionmaker) -> sessionmaker:
+    """Derive a session factory whose sessions do not open transactions.
+
+    Sessions share the engine (and its pool) of the given factory, but their
+    connections are in autocommit mode, so statements are sent without
+    BEGIN/COMMIT round trips. Only use them for reads.
+    """
+    engine = factory.kw['bind'].execution_options(isolation_level='AUTOCOMMIT')
+    return sessionmaker(**{**factory.kw, 'bind': engine})
+
+
+def dispose_engines():
+    """Close the connections of all engines, e.g. after a fork."""
+    for engine in list(_engines):
+        engine.dispose()
 
 
 def create_migrations(message):
@@ -0,0 +1,261 @@
+"""Publish/subscribe of events, e.g. changes to the tasks of a list.
+
+Events are JSON-compatible dicts published on channels. `Broker` delivers
+them to the subscribers of the current process. `PostgresBroker` sends them
+through PostgreSQL NOTIFY, so that they reach subscribers in all worker
+processes.
+"""
+
+import json
+import queue
+import select
+import threading
+
+from sqlalchemy import text
+
+from helpers.encoding import json_default
+
+BROKER_NAMES = ('memory', 'postgres')
+EVENT_STREAM_CONTENT_TYPE = 'text/event-stream'
+
+NOTIFY_CHANNEL = 'do_events'
+NOTIFY_MANY = text(
+    'SELECT pg_notify(:channel, payload) FROM unnest(:payloads) AS payload'
+).execution_options(autocommit=True)
+
+
+class TooManySubscribers(Exception):
+    """Raised by `Broker.subscribe()` beyond its `max_subscribers`."""
+
+
+class Subscription:
+    """Queue of the events published on a channel.
+
+    If the subscriber does not keep up, events are dropped once `max_size`
+    of them are pending.
+    """
+
+    def __init__(self, broker, channel, max_size: int=100):
+        self.broker = broker
+        self.channel = channel
+        self.events = queue.Queue(maxsize=max_size)
+        self.dropped = 0
+
+    def put(self, event: dict):
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def get(self, timeout: float=None):
+        """Return the next event, or None if none came within `timeout`."""
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """In-process, thread-safe event broker.
+
+    Parameters
+    ----------
+    max_subscribers : int, optional
+        Maximum number of subscriptions open at once, across channels.
+        Beyond it, `subscribe()` raises `TooManySubscribers`.
+    """
+
+    def __init__(self, max_subscribers: int=None):
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+        self._count = 0
+
+    def subscribe(self, channel) -> Subscription:
+        subscription = Subscription(self, channel)
+        with self._lock:
+            if (self.max_subscribers is not None
+                    and self._count >= self.max_subscribers):
+                raise TooManySubscribers(self.max_subscribers)
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+            self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel, ())
+            if subscription in subscriptions:
+                subscriptions.discard(subscription)
+                self._count -= 1
+            if not subscriptions:
+                self._subscriptions.pop(subscription.channel, None)
+
+    def publish(self, channel, event: dict):
+        """Send an event to the subscribers of a channel."""
+        self.publish_many([(channel, event)])
+
+    def publish_many(self, messages):
+        """Send events to the subscribers of their channels.
+
+        Parameters
+        ----------
+        messages : list of (channel, event) tuples
+        """
+        for channel, event in messages:
+            self.deliver(channel, event)
+
+    def deliver(self, channel, event: dict):
+        """Send an event to the subscribers of this process."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'channels': len(self._subscriptions),
+                'subscribers': self._count,
+            }
+
+
+class PostgresBroker(Broker):
+    """Event broker sharing events between processes with LISTEN/NOTIFY.
+
+    Events are published with NOTIFY, so their JSON encoding must fit in
+    8000 bytes. A thread of each process LISTENs on a dedicated connection
+    and delivers events to the local subscribers. It is started with the
+    first subscription, so that it runs in worker processes.
+
+    Parameters
+    ----------
+    engine : sqlalchemy.engine.Engine
+    poll_interval : float, optional
+        Seconds between checks that the listener should stop.
+    max_subscribers : int, optional
+        See `Broker`.
+    """
+
+    def __init__(self, engine, poll_interval: float=5,
+                 max_subscribers: int=None):
+        super().__init__(max_subscribers=max_subscribers)
+        self.engine = engine
+        self.poll_interval = poll_interval
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def subscribe(self, channel) -> Subscription:
+        self._start_listener()
+        return super().subscribe(channel)
+
+    def publish_many(self, messages):
+        # Datetimes (e.g. due dates) are formatted as in API responses.
+        payloads = [json.dumps({'channel': channel, 'event': event},
+                               default=json_default)
+                    for channel, event in messages]
+        if payloads:
+            # A single round trip, whatever the number of events.
+            self.engine.execute(NOTIFY_MANY, channel=NOTIFY_CHANNEL,
+                                payloads=payloads)
+
+    def _start_listener(self):
+        with self._lock:
+            # Threads do not survive a fork: check that it is alive.
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            connection = self.engine.raw_connection()
+            # The connection is kept for as long as the listener runs.
+            connection.detach()
+            connection = connection.connection
+            connection.rollback()
+            connection.autocommit = True
+            # Listen before returning, not to miss events published next.
+            connection.cursor().execute('LISTEN ' + NOTIFY_CHANNEL)
+            self._thread = threading.Thread(
+                target=self._listen, args=(connection,), daemon=True)
+            self._thread.start()
+
+    def _listen(self, connection):
+        try:
+            while not self._stopped.is_set():
+                readable, _, _ = select.select(
+                    [connection], [], [], self.poll_interval)
+                if not readable:
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    notify = connection.notifies.pop(0)
+                    message = json.loads(notify.payload)
+                    self.deliver(message['channel'], message['event'])
+        finally:
+            connection.close()
+
+    def stop(self):
+        """Stop the listener thread, within `poll_interval` seconds."""
+        self._stopped.set()
+
+
+def get_broker(name: str, engine=None, max_subscribers: int=None) -> Broker:
+    """Return an event broker.
+
+    Parameters
+    ----------
+    name : str
+        'memory' (events reach the subscribers of the publishing process)
+        or 'postgres' (events reach those of all processes).
+    engine : sqlalchemy.engine.Engine, optional
+        Required by the 'postgres' broker.
+    max_subscribers : int, optional
+        Maximum number of subscriptions open at once in this process.
+    """
+    if name == 'memory':
+        return Broker(max_subscribers=max_subscribers)
+    if name == 'postgres':
+        return PostgresBroker(engine, max_subscribers=max_subscribers)
+    raise ValueError('Unknown event broker: {!r}. Expected one of {}.'
+                     .format(name, BROKER_NAMES))
+
+
+def format_event(name: str, data: bytes) -> bytes:
+    """Format an event of a Server-Sent Events stream."""
+    return b'event: ' + name.encode('utf-8') + b'\ndata: ' + data + b'\n\n'
+
+
+def stream_events(subscription: Subscription, dumps, keepalive: float,
+                  end_on=()):
+    """Generate a Server-Sent Events stream from a subscription.
+
+    A comment is sent if no event came for `keepalive` seconds, so that
+    proxies keep the connection open and disconnected clients are noticed.
+    The subscription is closed along with the generator, which ends after
+    sending an event of one of the `end_on` types.
+
+    Parameters
+    ----------
+    subscription : Subscription
+    dumps : callable
+        JSON encoder returning bytes, see `helpers.encoding`.
+    keepalive : float
+    end_on : tuple of str, optional
+        Types of the events ending the stream, e.g. the deletion of what
+        the events are about.
+    """
+    try:
+        # Let the client know that it is subscribed.
+        yield b': subscribed\n\n'
+        while True:
+            event = subscription.get(timeout=keepalive)
+            if event is None:
+                yield b': keepalive\n\n'
+                continue
+            event = dict(event)
+            event_type = event.pop('type')
+            yield format_event(event_type, dumps(event))
+            if event_type in end_on:
+                return
+    finally:
+        subscription.close()
@@ -0,0 +1,45 @@
+"""Cooperative database access under gevent.
+
+When the app runs in gevent workers, requests are greenlets. By default,
+psycopg2 blocks the whole process while it waits for the database; with a
+wait callback, it yields to other greenlets instead, so that a single
+process serves many concurrent requests while queries run.
+
+gevent is an optional dependency.
+"""
+
+import psycopg2
+from psycopg2 import extensions
+
+
+def is_gevent_patched() -> bool:
+    """Return whether gevent has patched the standard library."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('socket')
+
+
+def gevent_wait_callback(conn, timeout=None):
+    """Wait for a connection by yielding to other greenlets."""
+    from gevent.socket import wait_read, wait_write
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            break
+        elif state == extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise psycopg2.OperationalError(
+                'Bad result from poll: {!r}'.format(state))
+
+
+def make_psycopg2_green():
+    """Make psycopg2 connections cooperate with gevent.
+
+    Note: COPY statements are not supported by green connections.
+    """
+    extensions.set_wait_callback(gevent_wait_callback)
@@ -0,0 +1,226 @@
+"""Request and database metrics.
+
+Requests are measured per route and method: latency, time spent in SQL
+statements and number of statements. Statements are timed by listening to
+engine events, and attributed to the request being handled by the current
+thread. Metrics are rendered in the Prometheus text exposition format.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds of histogram buckets.
+LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Count observed values in buckets with fixed upper bounds."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+
+    def cumulative_counts(self):
+        """Return pairs of bucket upper bounds and cumulative counts."""
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+
+class RequestStats:
+    """Time spent in SQL statements and number of statements of a request."""
+
+    __slots__ = ('db_time', 'statements')
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.statements = 0
+
+
+def _escape(value) -> str:
+    return (str(value).replace('\\', r'\\').replace('"', r'\"')
+            .replace('\n', r'\n'))
+
+
+def _format_labels(labels: dict) -> str:
+    return '{' + ','.join('{}="{}"'.format(name, _escape(value))
+                          for name, value in labels.items()) + '}'
+
+
+class RequestMetrics:
+    """Thread-safe registry of request and SQL statement metrics.
+
+    Parameters
+    ----------
+    latency_buckets : tuple of float, optional
+        Bucket bounds of request and database time histograms, in seconds.
+    statement_buckets : tuple of int, optional
+        Bucket bounds of the histogram of statements per request.
+    """
+
+    def __init__(self, latency_buckets=LATENCY_BUCKETS,
+                 statement_buckets=STATEMENT_BUCKETS):
+        self.latency_buckets = latency_buckets
+        self.statement_buckets = statement_buckets
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Keyed by (method, route, status).
+        self.requests = {}
+        # Keyed by (method, route).
+        self.latency = {}
+        self.db_time = {}
+        self.statements = {}
+        # All statements, including those run outside of requests.
+        self.statements_total = 0
+        self.db_time_total = 0.0
+
+    def instrument(self, engine):
+        """Time the SQL statements executed by an engine.
+
+        Engines derived with `execution_options()` share the listeners.
+        """
+        event.listen(engine, 'before_cursor_execute', self._before_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_execute)
+        event.listen(engine, 'handle_error', self._handle_error)
+
+    def _before_execute(self, conn, cursor, statement, parameters,
+                        context, executemany):
+        conn.info.setdefault('metrics_start', []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters,
+                       context, executemany):
+        self.record_statement(
+            time.perf_counter() - conn.info['metrics_start'].pop())
+
+    def _handle_error(self, context):
+        # Failed statements do not reach `after_cursor_execute`.
+        conn = context.connection
+        starts = conn is not None and conn.info.get('metrics_start')
+        if starts:
+            self.record_statement(time.perf_counter() - starts.pop())
+
+    def start_request(self) -> RequestStats:
+        """Start counting statements executed by the current thread."""
+        stats = self._local.stats = RequestStats()
+        return stats
+
+    def stop_request(self):
+        """Stop counting statements executed by the current thread."""
+        self._local.stats = None
+
+    @contextmanager
+    def resume_request(self, stats: RequestStats):
+        """Count statements executed in the block for a started request.
+
+        E.g. those executed while streaming the body of its response.
+        """
+        previous = getattr(self._local, 'stats', None)
+        self._local.stats = stats
+        try:
+            yield
+        finally:
+            self._local.stats = previous
+
+    def record_statement(self, duration: float):
+        with self._lock:
+            self.statements_total += 1
+            self.db_time_total += duration
+        stats = getattr(self._local, 'stats', None)
+        if stats is not None:
+            stats.db_time += duration
+            stats.statements += 1
+
+    def finish_request(self, method: str, route: str, status: str,
+                       duration: float, stats: RequestStats=None):
+        """Record a request handled by the current thread.
+
+        If `stats` are given, record that request instead.
+        """
+        if stats is None:
+            stats = getattr(self._local, 'stats', None)
+            self.stop_request()
+        if stats is None:
+            return
+        key = (method, route)
+        with self._lock:
+            requests_key = (method, route, status)
+            self.requests[requests_key] = (
+                self.requests.get(requests_key, 0) + 1)
+            if key not in self.latency:
+                self.latency[key] = Histogram(self.latency_buckets)
+                self.db_time[key] = Histogram(self.latency_buckets)
+                self.statements[key] = Histogram(self.statement_buckets)
+            self.latency[key].observe(duration)
+            self.db_time[key].observe(stats.db_time)
+            self.statements[key].observe(stats.statements)
+
+    def _render_histograms(self, name, help, histograms):
+        lines = [
+            '# HELP {} {}'.format(name, help),
+            '# TYPE {} histogram'.format(name),
+        ]
+        for (method, route), histogram in sorted(histograms.items()):
+            labels = {'method': method, 'route': route}
+            for bound, count in histogram.cumulative_counts():
+                lines.append('{}_bucket{} {}'.format(
+                    name, _format_labels({**labels, 'le': bound}), count))
+            lines.append('{}_bucket{} {}'.format(
+                name, _format_labels({**labels, 'le': '+Inf'}),
+                histogram.count))
+            lines.append('{}_sum{} {}'.format(
+                name, _format_labels(labels), histogram.sum))
+            lines.append('{}_count{} {}'.format(
+                name, _format_labels(labels), histogram.count))
+        return lines
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text format."""
+        with self._lock:
+            lines = [
+                '# HELP do_requests_total Requests handled.',
+                '# TYPE do_requests_total counter',
+            ]
+            for (method, route, status), count in sorted(
+                    self.requests.items()):
+                lines.append('do_requests_total{} {}'.format(_format_labels(
+                    {'method': method, 'route': route, 'status': status}),
+                    count))
+            lines += self._render_histograms(
+                'do_request_duration_seconds',
+                'Time spent handling requests.',
+                self.latency)
+            lines += self._render_histograms(
+                'do_request_db_duration_seconds',
+                'Time spent executing SQL statements, per request.',
+                self.db_time)
+            lines += self._render_histograms(
+                'do_request_db_statements',
+                'SQL statements executed, per request.',
+                self.statements)
+            lines += [
+                '# HELP do_db_statements_total SQL statements executed.',
+                '# TYPE do_db_statements_total counter',
+                'do_db_statements_total {}'.format(self.statements_total),
+                '# HELP do_db_duration_seconds_total '
+                'Time spent executing SQL statements.',
+                '# TYPE do_db_duration_seconds_total counter',
+                'do_db_duration_seconds_total {}'.format(self.db_time_total),
+            ]
+        return '\n'.join(lines) + '\n'
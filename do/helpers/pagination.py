@@ -0,0 +1,179 @@
+"""Keyset pagination helpers.
+
+Pages are ordered by a set of unique keys, and the next page starts
+strictly after the keys of the last row of the current page. The database
+can then answer each page with an index range scan, regardless of how deep
+the client is in the collection.
+
+As in PostgreSQL, NULL values sort last in ascending order and first in
+descending order.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+import falcon
+from sqlalchemy import and_, tuple_
+from sqlalchemy.sql import operators
+
+from utils import parse_datetime
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
+def encode_cursor(values) -> str:
+    """Encode key values into an opaque, URL-safe cursor."""
+    values = [value.isoformat() if isinstance(value, datetime) else value
+              for value in values]
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _coerce(column, value):
+    """Convert a decoded cursor value to the type of its column.
+
+    Raises a ValueError if the value is not of this type.
+    """
+    if value is None:
+        if not column.nullable:
+            raise ValueError('{} cannot be NULL'.format(column.key))
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return parse_datetime(value)
+    # Exact type check: JSON booleans are not integers.
+    if type(value) is not python_type:
+        raise ValueError('Expected {} for {}, got {!r}'.format(
+            python_type.__name__, column.key, value))
+    return value
+
+
+def decode_cursor(cursor: str, columns, param: str='after') -> list:
+    """Decode a cursor into key column values, or raise a 400 error.
+
+    Values must be of the Python type of their column, e.g. a cursor
+    crafted with a string for an integer column is rejected.
+
+    `param` is the name of the query parameter holding the cursor.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded).decode('utf-8'))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [_coerce(column, value)
+                for column, value in zip(columns, values)]
+    except (ValueError, TypeError, OverflowError):
+        raise falcon.HTTPInvalidParam('Malformed cursor.', param)
+
+
+def _unpack(key):
+    """Return the column of an ordering key and whether it is descending."""
+    if getattr(key, 'modifier', None) is operators.desc_op:
+        return key.element, True
+    return key, False
+
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _greater(column, value, descending: bool, nulls: bool) -> list:
+    """Conditions on a column selecting values sorted after `value`."""
+    if descending:
+        return [column.isnot(None) if value is None else column < value]
+    if value is None:
+        return []
+    if nulls and column.nullable:
+        return [column > value, column.is_(None)]
+    return [column > value]
+
+
+def _after(keys, values, nulls: bool=True) -> list:
+    """Conditions selecting rows sorted after the given key values.
+
+    The conditions select disjoint ranges of rows, each of which can be
+    scanned from an index on the keys (in their sort directions). An OR of
+    them could not: the database would scan the index from its start and
+    filter rows, making deep pages slow.
+    """
+    columns, descending = zip(*map(_unpack, keys))
+    nullable = nulls and any(column.nullable for column in columns)
+    if not any(descending) and None not in values and not nullable:
+        # Simple case: a row comparison, which indexes support best.
+        if len(keys) == 1:
+            return [columns[0] > values[0]]
+        return [tuple_(*columns) > tuple_(*values)]
+    # Lexicographic comparison: (a, b) > (x, y) <=> a > x or (a = x, b > y)
+    ranges = []
+    for i, column in enumerate(columns):
+        equal = [_equal(*pair) for pair in zip(columns[:i], values[:i])]
+        ranges.extend(
+            and_(*equal, condition)
+            for condition in _greater(column, values[i], descending[i], nulls)
+        )
+    return ranges
+
+
+def paginate(query, keys, limit: int, after: str=None, nulls: bool=True,
+             param: str='after'):
+    """Return a page of rows and the cursor of the next page (or None).
+
+    Parameters
+    ----------
+    query : sqlalchemy.orm.Query
+    keys : list of columns
+        Columns the rows are ordered by, optionally descending (e.g.
+        `Task.priority.desc()`). Together, they must be unique.
+    limit : int
+        Maximum number of rows in the page.
+    after : str, optional
+        Cursor returned along with the previous page.
+    nulls : bool, optional
+        Whether nullable keys may be NULL in the rows of the query. Passing
+        False when they cannot lets pages be selected by a row comparison.
+    param : str, optional
+        Name of the query parameter holding the cursor, for errors.
+    """
+    columns = [_unpack(key)[0] for key in keys]
+    if after is not None:
+        values = decode_cursor(after, columns, param=param)
+        ranges = _after(keys, values, nulls=nulls)
+        if not ranges:
+            return [], None
+        if len(ranges) > 1:
+            # Fetch the start of each range, then keep the first rows.
+            parts = [query.filter(condition)
+                     .order_by(*keys)
+                     .limit(limit + 1)
+                     for condition in ranges]
+            query = parts[0].union_all(*parts[1:])
+        else:
+            query = query.filter(*ranges)
+    # Fetch one extra row to know whether there is a next page.
+    rows = query.order_by(*keys).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, column.key)
+                               for column in columns)
+
+
+def paginate_request(request, response, query, keys, settings,
+                     **kwargs) -> list:
+    """Paginate a query using the `limit` and `after` query parameters.
+
+    The cursor of the next page, if any, is sent in the `X-Next-Cursor`
+    response header. Returns the rows of the requested page. Other keyword
+    arguments are passed to `paginate()`.
+    """
+    limit = request.get_param_as_int(
+        'limit', min=1, max=settings.MAX_PAGE_SIZE) or settings.PAGE_SIZE
+    after = request.get_param('after')
+    rows, next_cursor = paginate(query, keys, limit=limit, after=after,
+                                 **kwargs)
+    if next_cursor is not None:
+        response.set_header(NEXT_CURSOR_HEADER, next_cursor)
+    return rows
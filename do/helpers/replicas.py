@@ -0,0 +1,62 @@
+"""Read replicas."""
+
+import threading
+import time
+
+
+class ReplicaSet:
+    """Thread-safe round-robin choice of read replica session factories.
+
+    A replica that fails is skipped for a while, and reads go to the other
+    replicas (or to the primary if none is left).
+
+    Parameters
+    ----------
+    factories : list of sessionmaker
+        Session factories bound to the replicas.
+    retry_after : float, optional
+        Seconds during which a failed replica is skipped.
+    clock : callable, optional
+        Returns the current time, in seconds.
+    """
+
+    def __init__(self, factories: list, retry_after: float=30,
+                 clock=time.monotonic):
+        self.factories = list(factories)
+        self.retry_after = retry_after
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._next = 0
+        self._down_until = {}
+        self.reads = 0
+        self.failures = 0
+
+    def choose(self):
+        """Return the factory of the next available replica, or None."""
+        now = self.clock()
+        with self._lock:
+            for _ in range(len(self.factories)):
+                index = self._next
+                self._next = (index + 1) % len(self.factories)
+                if self._down_until.get(index, 0) <= now:
+                    self.reads += 1
+                    return self.factories[index]
+        return None
+
+    def mark_down(self, factory):
+        """Skip the replica of a factory, e.g. because it failed."""
+        index = self.factories.index(factory)
+        with self._lock:
+            self.failures += 1
+            self._down_until[index] = self.clock() + self.retry_after
+
+    def stats(self) -> dict:
+        now = self.clock()
+        with self._lock:
+            return {
+                'count': len(self.factories),
+                'down': sum(until > now
+                            for until in self._down_until.values()),
+                'reads': self.reads,
+                'failures': self.failures,
+            }
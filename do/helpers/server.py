@@ -0,0 +1,83 @@
+"""Application server (Gunicorn) configuration.
+
+Gunicorn also loads this module as a configuration file
+(`--config python:helpers.server`) for the server hooks it defines.
+"""
+
+import multiprocessing
+
+from helpers.db import dispose_engines
+from middleware.logging import restart_listeners
+
+PROFILES = ('dev', 'prod')
+CONFIG_MODULE = 'python:helpers.server'
+
+
+def get_worker_count(worker_class: str, cpu_count: int=None) -> int:
+    """Return a number of worker processes suited to the machine.
+
+    Parameters
+    ----------
+    worker_class : str
+        Gunicorn worker class, e.g. 'gthread' or 'gevent'.
+    cpu_count : int, optional
+        Defaults to the number of CPUs of the machine.
+    """
+    if cpu_count is None:
+        cpu_count = multiprocessing.cpu_count()
+    if worker_class == 'gevent':
+        # A gevent worker keeps its CPU busy on its own.
+        return cpu_count
+    # Other workers are idle while waiting for the database.
+    return 2 * cpu_count + 1
+
+
+def get_gunicorn_args(settings, profile: str='dev') -> list:
+    """Build Gunicorn command line options from the server settings.
+
+    Parameters
+    ----------
+    settings : Settings
+    profile : str, optional
+        'dev' runs a single worker (of class `SERVER_WORKER_CLASS`)
+        reloaded on code changes. 'prod' runs
+        as many workers as suited to the machine, preloading the app
+        unless workers are gevent ones.
+    """
+    if profile not in PROFILES:
+        raise ValueError('Unknown server profile: {!r}. Expected one of {}.'
+                         .format(profile, PROFILES))
+    worker_class = settings.SERVER_WORKER_CLASS
+    args = ['--bind', settings.SERVER_BIND, '--worker-class', worker_class]
+    if worker_class == 'gthread':
+        args += ['--threads', str(settings.SERVER_THREADS)]
+    elif worker_class == 'gevent':
+        args += ['--worker-connections',
+                 str(settings.SERVER_WORKER_CONNECTIONS)]
+    if profile == 'dev':
+        # A worker of the same class as in production, which the default
+        # of EVENTS_MAX_STREAMS is based on.
+        return [*args, '--reload']
+
+    workers = settings.SERVER_WORKERS or get_worker_count(worker_class)
+    args += [
+        '--config', CONFIG_MODULE,
+        '--workers', str(workers),
+        '--keep-alive', str(settings.SERVER_KEEPALIVE),
+        '--backlog', str(settings.SERVER_BACKLOG),
+    ]
+    # gevent workers patch the standard library once forked: an app
+    # preloaded by the master would keep unpatched thread locals and locks,
+    # shared by all the greenlets (i.e. requests) of a worker.
+    if settings.SERVER_PRELOAD and worker_class != 'gevent':
+        args.append('--preload')
+    return args
+
+
+def post_fork(server, worker):
+    """Reset the state inherited from the master process by a worker."""
+    # Database connections must not be shared between processes.
+    dispose_engines()
+    # Threads do not survive a fork.
+    restart_listeners()
+
@@ -0,0 +1,46 @@
+"""Streaming of JSON responses.
+
+Rows are fetched in batches from a server-side cursor and encoded as they
+arrive, so the memory used by a response does not depend on its size.
+"""
+
+
+def stream_json_array(engine, statement, serialize, dumps,
+                      batch_size: int, prefix: bytes=b'', suffix: bytes=b''):
+    """Generate a JSON array of serialized rows, as chunks of bytes.
+
+    The statement is executed on a dedicated connection, because the
+    response is streamed after the request's session has been closed. The
+    connection is released when the generator is exhausted or closed.
+
+    Parameters
+    ----------
+    engine : sqlalchemy.engine.Engine
+    statement : sqlalchemy.sql.Select
+    serialize : callable
+        Turns a row into a JSON-compatible object.
+    dumps : callable
+        JSON encoder returning bytes, see `helpers.encoding`.
+    batch_size : int
+        Number of rows fetched and encoded at once.
+    prefix, suffix : bytes, optional
+        Raw JSON to output before and after the array.
+    """
+    yield prefix + b'['
+    with engine.connect() as connection:
+        # Server-side cursors need a transaction, which connections of
+        # autocommit engines (see `helpers.db`) do not open.
+        connection = connection.execution_options(
+            isolation_level=connection.default_isolation_level,
+            stream_results=True)
+        with connection.begin():
+            result = connection.execute(statement)
+            separator = b''
+            while True:
+                rows = result.fetchmany(batch_size)
+                if not rows:
+                    break
+                # Strip the brackets of the encoded batch to join it to others.
+                yield separator + dumps([serialize(row) for row in rows])[1:-1]
+                separator = b','
+    yield b']' + suffix
@@ -1,2 +1,4 @@
 from .cors import CORS
 from .logging import ResponseLoggerMiddleware
+from .context import ResourceContextMiddleware
+from .metrics import MetricsMiddleware
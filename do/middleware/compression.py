@@ -0,0 +1,164 @@
+"""Response compression middleware.
+
+Responses are gzip-encoded, or brotli-encoded if the `brotli` package is
+installed and the client accepts it.
+"""
+
+import zlib
+
+import falcon
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ACCEPT_ENCODING_HEADER = 'Accept-Encoding'
+CONTENT_ENCODING_HEADER = 'Content-Encoding'
+COMPRESSIBLE_TYPES = ('application/json', 'text/')
+# Event streams must reach clients event by event.
+UNCOMPRESSED_TYPES = ('text/event-stream',)
+# zlib window size producing a gzip header and trailer.
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class GzipCoding:
+    """Gzip content coding."""
+
+    name = 'gzip'
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def _compressor(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, GZIP_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = self._compressor()
+        return compressor.compress(data) + compressor.flush()
+
+    def compress_stream(self, chunks):
+        compressor = self._compressor()
+        for chunk in chunks:
+            # Flush every chunk so that the response keeps streaming.
+            yield (compressor.compress(chunk)
+                   + compressor.flush(zlib.Z_SYNC_FLUSH))
+        yield compressor.flush()
+
+
+class BrotliCoding:
+    """Brotli content coding."""
+
+    name = 'br'
+
+    def __init__(self, quality: int):
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def compress_stream(self, chunks):
+        compressor = brotli.Compressor(quality=self.quality)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Return the quality of each coding listed in an Accept-Encoding."""
+    qualities = {}
+    for item in header.split(','):
+        coding, *params = item.split(';')
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    return qualities
+
+
+def _stream(coding, chunks):
+    try:
+        yield from coding.compress_stream(chunks)
+    finally:
+        # Release resources held by the original stream (e.g. a cursor).
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+class CompressionMiddleware:
+    """Compress response bodies if the client accepts it.
+
+    Must come before the middleware setting the response body (e.g.
+    `JSONEncoderMiddleware`) in the middleware list, so that it processes
+    responses after them.
+
+    Parameters
+    ----------
+    min_size : int, optional
+        Bodies smaller than this number of bytes are sent as is: compressing
+        them costs more than it saves. Streamed bodies are always compressed.
+    level : int, optional
+        Gzip compression level, from 1 (fastest) to 9 (smallest).
+    brotli_quality : int, optional
+        Brotli compression quality, from 0 (fastest) to 11 (smallest).
+    """
+
+    def __init__(self, min_size: int=1024, level: int=6,
+                 brotli_quality: int=4):
+        self.min_size = min_size
+        # By order of preference.
+        self.codings = [GzipCoding(level)]
+        if brotli is not None:
+            self.codings.insert(0, BrotliCoding(brotli_quality))
+
+    def select_coding(self, req):
+        """Return the preferred coding accepted by the client, or None."""
+        header = req.get_header(ACCEPT_ENCODING_HEADER)
+        if not header:
+            return None
+        qualities = parse_accept_encoding(header)
+        default = qualities.get('*', 0)
+        for coding in self.codings:
+            if qualities.get(coding.name, default) > 0:
+                return coding
+        return None
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        """Compress the response body, if large enough."""
+        if resp.get_header(CONTENT_ENCODING_HEADER) is not None:
+            return
+        content_type = resp.content_type or falcon.DEFAULT_MEDIA_TYPE
+        if (not content_type.startswith(COMPRESSIBLE_TYPES)
+                or content_type.startswith(UNCOMPRESSED_TYPES)):
+            return
+        if resp.stream is not None:
+            data = None
+        else:
+            data = resp.data
+            if resp.body is not None:
+                data = resp.body.encode('utf-8')
+            if data is None or len(data) < self.min_size:
+                return
+
+        # The response depends on Accept-Encoding from now on.
+        resp.append_header('Vary', ACCEPT_ENCODING_HEADER)
+        coding = self.select_coding(req)
+        if coding is None:
+            return
+
+        if data is None:
+            resp.stream = _stream(coding, resp.stream)
+        else:
+            resp.body = None
+            resp.data = coding.compress(data)
+        resp.set_header(CONTENT_ENCODING_HEADER, coding.name)
+        etag = resp.get_header('ETag')
+        if etag is not None and not etag.startswith('W/'):
+            # Compressed bytes differ from the uncompressed ones.
+            resp.set_header('ETag', 'W/' + etag)
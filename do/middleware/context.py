@@ -0,0 +1,13 @@
+"""Resource context middleware."""
+
+
+class ResourceContextMiddleware:
+    """Make app-level objects (settings, ...) available to resources."""
+
+    def __init__(self, **context):
+        self.context = context
+
+    def process_resource(self, req, resp, resource, params):
+        """Attach context objects to the resource."""
+        for name, value in self.context.items():
+            setattr(resource, name, value)
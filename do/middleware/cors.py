@@ -8,83 +8,109 @@ REQUEST_HEADERS_HEADER = 'Access-Control-Request-Headers'
 ALLOW_HEADERS_HEADER = 'Access-Control-Allow-Headers'
 REQUEST_METHOD_HEADER = 'Access-Control-Request-Method'
 ALLOW_METHODS_HEADER = 'Access-Control-Allow-Methods'
+EXPOSE_HEADERS_HEADER = 'Access-Control-Expose-Headers'
+MAX_AGE_HEADER = 'Access-Control-Max-Age'
 ALL = '*'
 
 
 class CorsMiddleware:
-    """Simple middleware that checks request origin."""
+    """Simple middleware that checks request origin.
+
+    Preflight requests are answered here, without routing them nor running
+    the middleware that follows.
+    """
 
     def __init__(self, cors):
         self.cors = cors
 
     def process_request(self, request, response):
         """Main Falcon middleware hook."""
-        return self.cors.process(request, response)
+        self.cors.process(request, response)
+        if self.cors.is_preflight(request):
+            raise falcon.HTTPStatus(falcon.HTTP_204)
 
 
 class CORS:
-    """Wrapper to build a CORS middleware."""
+    """Wrapper to build a CORS middleware.
+
+    Parameters
+    ----------
+    max_age : int, optional
+        Seconds during which browsers may cache the result of a preflight
+        request. If None (the default), browsers use their own default.
+    """
 
     def __init__(self, allowed_origins=None,
                  allow_all_origins=False,
                  allowed_headers=None,
                  allow_all_headers=False,
                  allowed_methods=None,
-                 allow_all_methods=False):
+                 allow_all_methods=False,
+                 exposed_headers=None,
+                 max_age=None):
         # Origins
         if allow_all_origins:
             allowed_origins = [ALL]
-        self.allowed_origins = allowed_origins or []
         # Headers
         if allow_all_headers:
             allowed_headers = [ALL]
-        self.allowed_headers = allowed_headers or []
         # Methods
         if allow_all_methods:
             allowed_methods = [ALL]
-        self.allowed_methods = allowed_methods or []
-        self._normalize()
-
-    def _normalize(self):
-        self.allowed_headers = [header.lower()
-                                for header in self.allowed_headers]
-        self.allowed_methods = [method.upper()
-                                for method in self.allowed_methods]
+        # Sets of allowed values, and whether any value is allowed.
+        self.allowed_origins = frozenset(allowed_origins or [])
+        self.allowed_headers = frozenset(
+            header.lower() for header in allowed_headers or [])
+        self.allowed_methods = frozenset(
+            method.upper() for method in allowed_methods or [])
+        self.allow_all_origins = ALL in self.allowed_origins
+        self.allow_all_headers = ALL in self.allowed_headers
+        self.allow_all_methods = ALL in self.allowed_methods
+        # Response headers readable by the client
+        self.exposed_headers = ','.join(exposed_headers or [])
+        self.max_age = None if max_age is None else str(max_age)
 
     def Middleware(self):
         """Build and return a CorsMiddleware object."""
         return CorsMiddleware(cors=self)
 
+    @staticmethod
+    def is_preflight(req) -> bool:
+        return (req.method == 'OPTIONS'
+                and req.get_header(ORIGIN_HEADER) is not None
+                and req.get_header(REQUEST_METHOD_HEADER) is not None)
+
     def process(self, req, resp):
         method = req.get_header(REQUEST_METHOD_HEADER)
-        self._process_method(req, resp, method)
+        if method:
+            self._process_method(req, resp, method)
+            if self.max_age is not None:
+                resp.set_header(MAX_AGE_HEADER, self.max_age)
 
         origin = req.get_header(ORIGIN_HEADER)
         if origin:
             self._process_origin(req, resp, origin)
+            if self.exposed_headers:
+                resp.set_header(EXPOSE_HEADERS_HEADER, self.exposed_headers)
 
         request_headers = req.get_header(REQUEST_HEADERS_HEADER)
         if request_headers:
             self._process_allowed_headers(req, resp, request_headers)
 
-    def _allow(self, prop: str, value):
-        allowed_values = getattr(self, 'allowed_' + prop)
-        if ALL in allowed_values:
-            return True
-        return value.lower() in allowed_values
-
-    def _process_method(self, req, resp, request_method):
-        if self._allow('methods', request_method):
+    def _process_method(self, req, resp, request_method: str):
+        if (self.allow_all_methods
+                or request_method.upper() in self.allowed_methods):
             resp.set_header(ALLOW_METHODS_HEADER, request_method)
 
     def _process_origin(self, req, resp, origin: str):
-        if self._allow('origins', origin):
+        if self.allow_all_origins or origin in self.allowed_origins:
             resp.set_header(ALLOW_ORIGIN_HEADER, origin)
 
     def _process_allowed_headers(self, req, resp, request_headers: str):
         allowed_headers_list = [
             header for header in request_headers.split(',')
-            if self._allow('headers', header)
+            if self.allow_all_headers
+            or header.strip().lower() in self.allowed_headers
         ]
         allowed_headers = ','.join(allowed_headers_list)
         resp.set_header(ALLOW_HEADERS_HEADER, allowed_headers)
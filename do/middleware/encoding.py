@@ -0,0 +1,21 @@
+"""JSON response encoding middleware."""
+
+
+class JSONEncoderMiddleware:
+    """Encode the `json` attribute of responses with a given encoder.
+
+    Must come after `JSONBodyMiddleware` (or `falcon_jsonify.Middleware`) in
+    the middleware list, so that responses are encoded here instead of by
+    `falcon_jsonify`.
+    """
+
+    def __init__(self, dumps):
+        self.dumps = dumps
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        """Encode the response payload, if any."""
+        json = getattr(resp, 'json', None)
+        if json is not None:
+            resp.data = self.dumps(json)
+            # Prevent falcon_jsonify from encoding the payload again.
+            del resp.json
@@ -0,0 +1,36 @@
+"""JSON request body middleware."""
+
+from functools import partial
+
+import falcon_jsonify
+
+
+class JSONBodyMiddleware(falcon_jsonify.Middleware):
+    """Parse JSON request bodies, like `falcon_jsonify.Middleware`.
+
+    `falcon_jsonify` keeps the request being parsed on the middleware, which
+    all threads share, and its `req.get_json` reads the body of that
+    request: with concurrent requests, it may read the body of another one.
+    Here, `req.get_json` reads the body of its own request.
+    """
+
+    def process_request(self, req, resp):
+        """Parse the request body, if any."""
+        super().process_request(req, resp)
+        if hasattr(req, 'get_json'):
+            req.get_json = partial(self.get_request_json, req)
+
+    def get_request_json(self, req, field, **kwargs):
+        """Access and validate a JSON field of the body of a request.
+
+        Accepts the validators of `falcon_jsonify.Middleware.validate()`.
+        """
+        if field in req.json:
+            value = req.json[field]
+            kwargs.pop('default', None)
+        elif 'default' not in kwargs:
+            self.bad_request('Missing JSON field',
+                             "Field '{}' is required".format(field))
+        else:
+            value = kwargs.pop('default')
+        return self.validate(field, value, **kwargs)
@@ -1,6 +1,13 @@
 """Logging middleware."""
 
+import atexit
+import json
 import logging
+import queue
+import random
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
 default_logger = logging.getLogger(__name__)
 handler = logging.StreamHandler()
@@ -10,21 +17,115 @@ handler.setFormatter(formatter)
 default_logger.addHandler(handler)
 default_logger.setLevel(logging.INFO)
 
+# Background listeners of queued loggers, by logger.
+_listeners = {}
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as JSON lines, including their `access` fields."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(),
+            'level': record.levelname,
+            'pid': record.process,
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'access', {}))
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def get_handlers(logger: logging.Logger) -> list:
+    """Return the handlers that output the records of a logger."""
+    listener = _listeners.get(logger)
+    return list(listener.handlers) if listener else logger.handlers
+
+
+def enqueue_handlers(logger: logging.Logger) -> QueueListener:
+    """Move the handlers of a logger to a background thread.
+
+    Records are put in a queue by the logging thread and output by a
+    listener thread, so that slow writes do not block requests. Safe to call
+    several times: the logger keeps its listener.
+    """
+    if logger in _listeners:
+        return _listeners[logger]
+    records = queue.Queue()
+    listener = QueueListener(records, *logger.handlers,
+                             respect_handler_level=True)
+    for queued_handler in listener.handlers:
+        logger.removeHandler(queued_handler)
+    logger.addHandler(QueueHandler(records))
+    listener.start()
+    _listeners[logger] = listener
+    return listener
+
+
+def restart_listeners():
+    """Start listener threads again in a forked process.
+
+    Queues are replaced too, as the locks they copied from the parent
+    process may be in an inconsistent state.
+    """
+    for logger, listener in _listeners.items():
+        records = queue.Queue()
+        listener.queue = records
+        for queue_handler in logger.handlers:
+            if isinstance(queue_handler, QueueHandler):
+                queue_handler.queue = records
+        listener.start()
+
+
+@atexit.register
+def stop_listeners():
+    """Output pending records and stop the listener threads."""
+    while _listeners:
+        _, listener = _listeners.popitem()
+        listener.stop()
+
 
 class ResponseLoggerMiddleware:
-    """Simple response logger middleware."""
+    """Response logger middleware.
+
+    Parameters
+    ----------
+    logger : logging.Logger, optional
+    log_format : str, optional
+        Template of text log lines, formatted with the request (`req`), the
+        response (`resp`), `status_code` and `latency_ms`.
+    structured : bool, optional
+        Output JSON lines instead of text lines. Defaults to False.
+    queued : bool, optional
+        Output log lines from a background thread. Defaults to False.
+    sample_rate : float, optional
+        Fraction of successful (< 400) responses that are logged. Other
+        responses are always logged. Defaults to 1.
+    """
 
     log_format = (
-        "{req.scheme} {req.method} {req.relative_uri}"
-        "{status_code} {req.host} {req.user_agent}"
+        "{req.scheme} {req.method} {req.relative_uri} "
+        "{status_code} {req.host} {req.user_agent} {latency_ms:.1f}ms"
     )
 
-    def __init__(self, logger=None, log_format=None):
+    def __init__(self, logger=None, log_format=None, structured=False,
+                 queued=False, sample_rate=1.0):
         if not logger:
             logger = default_logger
         if log_format is not None:
             self.log_format = log_format
+        if structured:
+            for output_handler in get_handlers(logger):
+                output_handler.setFormatter(JSONFormatter())
+        if queued:
+            enqueue_handlers(logger)
         self.logger = logger
+        self.structured = structured
+        self.sample_rate = sample_rate
+
+    def process_request(self, req, resp):
+        """Start timing the request."""
+        req.context['log_start'] = time.perf_counter()
 
     def process_resource(self, req, resp, resource, params):
         """Make logger available to resource classes."""
@@ -32,6 +133,25 @@ class ResponseLoggerMiddleware:
 
     def process_response(self, req, resp, resource, req_succeeded):
         """Output request and response info to logger."""
-        self.logger.info(self.log_format.format(
-            req=req, resp=resp, status_code=resp.status[:3]
-        ))
+        status_code = resp.status[:3]
+        if status_code < '400' and random.random() >= self.sample_rate:
+            return
+        start = req.context.get('log_start', time.perf_counter())
+        latency_ms = (time.perf_counter() - start) * 1000
+        if self.structured:
+            # Only gather plain values here: records are encoded by the
+            # output handler, possibly in the listener thread.
+            self.logger.info('access', extra={'access': {
+                'method': req.method,
+                'path': req.path,
+                'query': req.query_string,
+                'status': int(status_code),
+                'latency_ms': round(latency_ms, 3),
+                'remote_addr': req.remote_addr,
+                'user_agent': req.user_agent,
+            }})
+        else:
+            self.logger.info(self.log_format.format(
+                req=req, resp=resp, status_code=status_code,
+                latency_ms=latency_ms,
+            ))
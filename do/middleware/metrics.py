@@ -0,0 +1,65 @@
+"""Metrics middleware."""
+
+import time
+from functools import partial
+
+UNMATCHED_ROUTE = 'unmatched'
+
+
+class MetricsMiddleware:
+    """Record the latency and SQL statements of each request.
+
+    Should come first in the middleware list, so that the time spent in
+    other middleware is measured too.
+
+    Streamed responses are recorded once their body has been sent, along
+    with the statements executed while streaming it.
+
+    Parameters
+    ----------
+    metrics : helpers.metrics.RequestMetrics
+    routes : dict
+        The uri-resource mapping of the app, used to label requests by
+        route instead of by (unbounded) path.
+    """
+
+    def __init__(self, metrics, routes: dict):
+        self.metrics = metrics
+        self.templates = {resource: uri_template
+                          for uri_template, resource in routes.items()}
+
+    def process_request(self, req, resp):
+        """Start measuring the request."""
+        req.context['metrics_start'] = time.perf_counter()
+        req.context['metrics_stats'] = self.metrics.start_request()
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        """Record the request, or its streamed response once sent."""
+        start = req.context.get('metrics_start')
+        if start is None:
+            return
+        stats = req.context['metrics_stats']
+        self.metrics.stop_request()
+        route = self.templates.get(resource, UNMATCHED_ROUTE)
+        finish = partial(self.metrics.finish_request, req.method, route,
+                         resp.status[:3], stats=stats)
+        if resp.stream is not None:
+            resp.stream = self._measure_stream(resp.stream, stats, start,
+                                               finish)
+        else:
+            finish(time.perf_counter() - start)
+
+    def _measure_stream(self, stream, stats, start, finish):
+        chunks = iter(stream)
+        try:
+            while True:
+                with self.metrics.resume_request(stats):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            close = getattr(stream, 'close', None)
+            if close is not None:
+                close()
+            finish(time.perf_counter() - start)
@@ -4,22 +4,127 @@ Inspired by:
 https://eshlox.net/2017/07/28/integrate-sqlalchemy-with-falcon-framework/
 """
 
+import threading
+import time
+
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import scoped_session, sessionmaker
 
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Time until which a client reads from the primary, sent with responses to
+# writes. Cross-origin clients echo the header (cookies are not sent to
+# other origins); browsers send the cookie back to the same origin.
+READ_PRIMARY_HEADER = 'X-Read-Primary-Until'
+READ_PRIMARY_COOKIE = 'read_primary_until'
+
 
 class SQLAlchemySessionManager:
-    """Create scoped session for every request, close it when request ends."""
+    """Provide a scoped session to every request, close it when it ends.
+
+    Resources get a `scoped_session` proxy: the session of the current
+    thread is only created the first time it is used, so requests that do
+    not touch the database never create one.
+
+    If a `read_factory` is given, it is used for requests with safe methods
+    (GET, HEAD, OPTIONS), e.g. to avoid opening a transaction.
+
+    If `replicas` are given, safe requests read from one of them instead,
+    falling back to `read_factory` if it cannot be connected to. After a
+    successful write, the client is told to read from the primary for
+    `read_your_writes` seconds (in the `X-Read-Primary-Until` header and
+    a cookie), so that it sees its changes even if replicas lag behind.
+
+    Parameters
+    ----------
+    factory : sessionmaker
+    read_factory : sessionmaker, optional
+    replicas : helpers.replicas.ReplicaSet, optional
+    read_your_writes : int, optional
+        Defaults to 5 seconds.
+    """
 
-    def __init__(self, factory: sessionmaker):
-        self.scoped_session_factory = scoped_session(factory)
+    def __init__(self, factory: sessionmaker, read_factory: sessionmaker=None,
+                 replicas=None, read_your_writes: int=5):
+        self.factory = factory
+        self.read_factory = read_factory or factory
+        self.replicas = replicas
+        self.read_your_writes = read_your_writes
+        self.session = scoped_session(self._create_session)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.sessions_created = 0
+
+    def get_session_factory(self, req) -> sessionmaker:
+        """Return the session factory to use for a request."""
+        if req.method in SAFE_METHODS:
+            return self.read_factory
+        return self.factory
+
+    def use_replica(self, req) -> bool:
+        """Return whether a request may read from a replica."""
+        if self.replicas is None or req.method not in SAFE_METHODS:
+            return False
+        read_primary_until = (req.get_header(READ_PRIMARY_HEADER)
+                              or req.cookies.get(READ_PRIMARY_COOKIE))
+        try:
+            return float(read_primary_until) <= time.time()
+        except (TypeError, ValueError):
+            return True
+
+    def _create_replica_session(self):
+        factory = self.replicas.choose()
+        if factory is None:
+            return None
+        session = factory()
+        try:
+            # Connect now, to fall back to the primary on failure.
+            session.connection()
+        except DBAPIError:
+            session.close()
+            self.replicas.mark_down(factory)
+            return None
+        return session
+
+    def _create_session(self):
+        with self._lock:
+            self.sessions_created += 1
+        if self._local.replica:
+            session = self._create_replica_session()
+            if session is not None:
+                return session
+        return self._local.factory()
+
+    def process_request(self, req, resp):
+        """Select the session factory of the request."""
+        self._local.factory = self.get_session_factory(req)
+        self._local.replica = self.use_replica(req)
+        with self._lock:
+            self.requests += 1
 
     def process_resource(self, req, resp, resource, params):
-        """Attach the session to the resource."""
-        resource.session = self.scoped_session_factory()
+        """Attach the session proxy to the resource."""
+        resource.session = self.session
 
     def process_response(self, req, resp, resource, req_succeeded):
-        """Close the session in the resource, if any."""
-        if hasattr(resource, 'session'):
+        """Close the session of the request, if it was created."""
+        if self.session.registry.has():
             if not req_succeeded:
-                resource.session.rollback()
-        self.scoped_session_factory.remove()
+                self.session.rollback()
+            self.session.remove()
+        if (self.replicas is not None and req_succeeded
+                and req.method not in SAFE_METHODS):
+            read_primary_until = str(time.time() + self.read_your_writes)
+            resp.set_header(READ_PRIMARY_HEADER, read_primary_until)
+            resp.set_cookie(
+                READ_PRIMARY_COOKIE, read_primary_until,
+                max_age=self.read_your_writes, path='/',
+                secure=req.scheme == 'https')
+
+    def stats(self) -> dict:
+        """Return the number of requests and of sessions created."""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'created': self.sessions_created,
+            }
@@ -0,0 +1,29 @@
+"""list version
+
+Revision ID: 0e8cd15baf60
+Revises: 5e308b0b00c2
+Create Date: 2026-10-18 11:02:17.840263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0e8cd15baf60'
+down_revision = '5e308b0b00c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('list', sa.Column('version', sa.Integer(), nullable=False,
+                                    server_default=sa.text('1')))
+    op.add_column('list', sa.Column(
+        'updated_at', sa.DateTime(), nullable=False,
+        server_default=sa.text("timezone('utc', now())")))
+
+
+def downgrade():
+    op.drop_column('list', 'updated_at')
+    op.drop_column('list', 'version')
@@ -0,0 +1,25 @@
+"""task open due date index
+
+Revision ID: 1426b7b0d36e
+Revises: a45655b3e783
+Create Date: 2026-10-18 12:20:44.107351
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1426b7b0d36e'
+down_revision = 'a45655b3e783'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_task_open_due_date', 'task', ['due_date', 'id'],
+                    postgresql_where=sa.text('NOT completed'))
+
+
+def downgrade():
+    op.drop_index('ix_task_open_due_date', table_name='task')
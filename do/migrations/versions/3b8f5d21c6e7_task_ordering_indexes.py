@@ -0,0 +1,37 @@
+"""task ordering indexes
+
+Revision ID: 3b8f5d21c6e7
+Revises: 7c1e9a2f4d3b
+Create Date: 2026-10-18 16:42:10.218733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8f5d21c6e7'
+down_revision = '7c1e9a2f4d3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_task_list_id_due_date', table_name='task')
+    op.drop_index('ix_task_list_id_completed_priority_due_date',
+                  table_name='task')
+    op.create_index('ix_task_list_id_id', 'task', ['list_id', 'id'])
+    op.create_index('ix_task_list_id_priority_id', 'task',
+                    ['list_id', sa.text('priority DESC'), 'id'])
+    op.create_index('ix_task_list_id_due_date_id', 'task',
+                    ['list_id', 'due_date', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_task_list_id_due_date_id', table_name='task')
+    op.drop_index('ix_task_list_id_priority_id', table_name='task')
+    op.drop_index('ix_task_list_id_id', table_name='task')
+    op.create_index('ix_task_list_id_completed_priority_due_date', 'task',
+                    ['list_id', 'completed', 'priority', 'due_date'])
+    op.create_index('ix_task_list_id_due_date', 'task',
+                    ['list_id', 'due_date'])
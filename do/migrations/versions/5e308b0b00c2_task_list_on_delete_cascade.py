@@ -0,0 +1,28 @@
+"""task list on delete cascade
+
+Revision ID: 5e308b0b00c2
+Revises: bd5ffd496a83
+Create Date: 2026-10-18 10:12:41.204118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e308b0b00c2'
+down_revision = 'bd5ffd496a83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_constraint('task_list_id_fkey', 'task', type_='foreignkey')
+    op.create_foreign_key('task_list_id_fkey', 'task', 'list',
+                          ['list_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade():
+    op.drop_constraint('task_list_id_fkey', 'task', type_='foreignkey')
+    op.create_foreign_key('task_list_id_fkey', 'task', 'list',
+                          ['list_id'], ['id'])
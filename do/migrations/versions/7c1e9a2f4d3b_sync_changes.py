@@ -0,0 +1,42 @@
+"""sync changes
+
+Revision ID: 7c1e9a2f4d3b
+Revises: 1426b7b0d36e
+Create Date: 2026-10-18 14:05:31.412907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e9a2f4d3b'
+down_revision = '1426b7b0d36e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task', sa.Column(
+        'updated_at', sa.DateTime(), nullable=False,
+        server_default=sa.text("timezone('utc', now())")))
+    op.create_index('ix_list_updated_at', 'list', ['updated_at'])
+    op.create_index('ix_task_updated_at', 'task', ['updated_at'])
+    op.create_table(
+        'deletion',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entity', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False,
+                  server_default=sa.text("timezone('utc', now())")),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_deletion_deleted_at', 'deletion', ['deleted_at'])
+
+
+def downgrade():
+    op.drop_index('ix_deletion_deleted_at', table_name='deletion')
+    op.drop_table('deletion')
+    op.drop_index('ix_task_updated_at', table_name='task')
+    op.drop_index('ix_list_updated_at', table_name='list')
+    op.drop_column('task', 'updated_at')
@@ -0,0 +1,35 @@
+"""changes paging indexes
+
+Revision ID: 9d4e6a1c7b25
+Revises: 3b8f5d21c6e7
+Create Date: 2026-10-18 18:05:37.402519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4e6a1c7b25'
+down_revision = '3b8f5d21c6e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_list_updated_at', table_name='list')
+    op.drop_index('ix_task_updated_at', table_name='task')
+    op.drop_index('ix_deletion_deleted_at', table_name='deletion')
+    op.create_index('ix_list_updated_at_id', 'list', ['updated_at', 'id'])
+    op.create_index('ix_task_updated_at_id', 'task', ['updated_at', 'id'])
+    op.create_index('ix_deletion_deleted_at_id', 'deletion',
+                    ['deleted_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_deletion_deleted_at_id', table_name='deletion')
+    op.drop_index('ix_task_updated_at_id', table_name='task')
+    op.drop_index('ix_list_updated_at_id', table_name='list')
+    op.create_index('ix_deletion_deleted_at', 'deletion', ['deleted_at'])
+    op.create_index('ix_task_updated_at', 'task', ['updated_at'])
+    op.create_index('ix_list_updated_at', 'list', ['updated_at'])
@@ -0,0 +1,29 @@
+"""task indexes
+
+Revision ID: a45655b3e783
+Revises: 0e8cd15baf60
+Create Date: 2026-10-18 11:48:05.613902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a45655b3e783'
+down_revision = '0e8cd15baf60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_task_list_id_completed_priority_due_date', 'task',
+                    ['list_id', 'completed', 'priority', 'due_date'])
+    op.create_index('ix_task_list_id_due_date', 'task',
+                    ['list_id', 'due_date'])
+
+
+def downgrade():
+    op.drop_index('ix_task_list_id_due_date', table_name='task')
+    op.drop_index('ix_task_list_id_completed_priority_due_date',
+                  table_name='task')
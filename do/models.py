@@ -2,20 +2,37 @@
 
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Boolean
+from sqlalchemy import (Column, String, Integer, ForeignKey, DateTime, Boolean,
+                        Index, func, text)
 
 
 Base = declarative_base()
 
 
+def utc_now():
+    """Return the current (transaction) time in UTC, computed by PostgreSQL."""
+    return func.timezone('utc', func.now())
+
+
 class List(Base):
     __tablename__ = 'list'
 
     id = Column(Integer, primary_key=True)
     title = Column(String(250), nullable=False)
     # cascade='all': list deleted => tasks deleted
-    tasks = relationship('Task', cascade='all')
+    # passive_deletes: tasks are deleted by the database (ON DELETE CASCADE)
+    tasks = relationship('Task', cascade='all', passive_deletes=True)
     archived = Column(Boolean, nullable=False, default=False)
+    # Bumped whenever the list or its tasks change.
+    version = Column(Integer, nullable=False, server_default=text('1'))
+    updated_at = Column(DateTime(), nullable=False,
+                        server_default=text("timezone('utc', now())"),
+                        onupdate=utc_now())
+
+    __table_args__ = (
+        # Pages of changes, see `queries.load_changes()`.
+        Index('ix_list_updated_at_id', updated_at, id),
+    )
 
     @property
     def serialized(self):
@@ -26,10 +43,15 @@ class List(Base):
 
     @property
     def serialized_simple(self):
+        return List.serialize_row(self)
+
+    @staticmethod
+    def serialize_row(row) -> dict:
+        """Serialize a list object or a row of list columns."""
         return {
-            'id': self.id,
-            'title': self.title,
-            'archived': self.archived,
+            'id': row.id,
+            'title': row.title,
+            'archived': row.archived,
         }
 
 
@@ -41,16 +63,65 @@ class Task(Base):
     due_date = Column(DateTime(), nullable=True)
     completed = Column(Boolean, nullable=False, default=False)
     priority = Column(Integer, nullable=False, default=0)
-    list_id = Column(Integer, ForeignKey('list.id'))
+    list_id = Column(Integer, ForeignKey('list.id', ondelete='CASCADE'))
     list = relationship(List)
+    updated_at = Column(DateTime(), nullable=False,
+                        server_default=text("timezone('utc', now())"),
+                        onupdate=utc_now())
+
+    __table_args__ = (
+        # Pages of changes, see `queries.load_changes()`.
+        Index('ix_task_updated_at_id', updated_at, id),
+        # Pages of the tasks of a list, in the orders of
+        # `ListTasksResource.orderings`.
+        Index('ix_task_list_id_id', list_id, id),
+        Index('ix_task_list_id_priority_id', list_id, priority.desc(), id),
+        Index('ix_task_list_id_due_date_id', list_id, due_date, id),
+        # Agenda of open tasks, across lists.
+        Index('ix_task_open_due_date', due_date, id,
+              postgresql_where=~completed),
+    )
 
     @property
     def serialized(self):
+        return Task.serialize_row(self)
+
+    @staticmethod
+    def serialize_row(row) -> dict:
+        """Serialize a task object or a row of task columns."""
         return {
-            'id': self.id,
-            'list_id': self.list_id,
-            'title': self.title,
-            'due_date': self.due_date and str(self.due_date) or None,
-            'completed': self.completed,
-            'priority': self.priority,
+            'id': row.id,
+            'list_id': row.list_id,
+            'title': row.title,
+            # Formatted by the JSON encoder, see `helpers.encoding`.
+            'due_date': row.due_date,
+            'completed': row.completed,
+            'priority': row.priority,
         }
+
+
+class Deletion(Base):
+    """Tombstone of a deleted list or task, for clients to sync deletions.
+
+    The tasks of a deleted list have no tombstone of their own.
+    """
+
+    __tablename__ = 'deletion'
+
+    id = Column(Integer, primary_key=True)
+    # 'list' or 'task'
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(), nullable=False,
+                        server_default=text("timezone('utc', now())"))
+
+    __table_args__ = (
+        # Pages of changes, and pruning of old tombstones.
+        Index('ix_deletion_deleted_at_id', deleted_at, id),
+    )
+
+
+# Columns needed to serialize objects without loading them through the ORM.
+LIST_COLUMNS = (List.id, List.title, List.archived)
+TASK_COLUMNS = (Task.id, Task.list_id, Task.title, Task.due_date,
+                Task.completed, Task.priority)
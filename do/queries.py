@@ -0,0 +1,179 @@
+"""Database queries.
+
+Loaders select only the columns needed by the API and build dictionaries
+straight from the result rows, skipping ORM hydration.
+"""
+
+from datetime import timedelta
+
+import falcon
+from sqlalchemy import select
+
+from helpers import paginate
+
+from models import List, Task, Deletion, LIST_COLUMNS, TASK_COLUMNS, utc_now
+from utils import get_or_404
+
+
+def get_list_validators(session, id: int) -> tuple:
+    """Return the ETag and last modification time of a list.
+
+    Raises a 404 error if the list does not exist.
+    """
+    row = (session.query(List.version, List.updated_at)
+           .filter(List.id == id)
+           .first())
+    if row is None:
+        raise falcon.HTTPNotFound()
+    return '"{}"'.format(row.version), row.updated_at
+
+
+def touch_lists(session, list_ids):
+    """Bump the version of lists, e.g. because their tasks changed."""
+    session.execute(
+        List.__table__.update()
+        .where(List.id.in_(list_ids))
+        .values(version=List.version + 1, updated_at=utc_now())
+    )
+
+
+def record_deletions(session, entity: str, ids, retention: timedelta=None):
+    """Leave tombstones of deleted lists or tasks, for `load_changes()`.
+
+    Tombstones older than `retention`, if given, are pruned.
+    """
+    session.execute(Deletion.__table__.insert(), [
+        {'entity': entity, 'entity_id': id} for id in ids
+    ])
+    if retention is not None:
+        session.execute(
+            Deletion.__table__.delete()
+            .where(Deletion.deleted_at < utc_now() - retention)
+        )
+
+
+# Sections of the changes, in the order they are paged through.
+CHANGES_SECTIONS = ('lists', 'tasks', 'deleted')
+
+
+def _changes_sections(session, since, changes: dict) -> list:
+    """Return the query, keys and row handler of each changes section."""
+    lists = session.query(*LIST_COLUMNS, List.updated_at)
+    tasks = session.query(*TASK_COLUMNS, Task.updated_at)
+    deletions = session.query(Deletion.entity, Deletion.entity_id,
+                              Deletion.deleted_at, Deletion.id)
+    if since is not None:
+        lists = lists.filter(List.updated_at > since)
+        tasks = tasks.filter(Task.updated_at > since)
+        deletions = deletions.filter(Deletion.deleted_at > since)
+    else:
+        # Nothing to delete on a client that has nothing yet.
+        deletions = None
+
+    def add_deletion(row):
+        changes['deleted'][row.entity + 's'].append(row.entity_id)
+
+    return [
+        (lists, [List.updated_at, List.id],
+         lambda row: changes['lists'].append(List.serialize_row(row))),
+        (tasks, [Task.updated_at, Task.id],
+         lambda row: changes['tasks'].append(Task.serialize_row(row))),
+        (deletions, [Deletion.deleted_at, Deletion.id], add_deletion),
+    ]
+
+
+def load_changes(session, limit: int, since=None, lag: float=0,
+                 retention: timedelta=None, next_since=None,
+                 section: int=0, after: str=None) -> tuple:
+    """Load a page of the lists and tasks changed or deleted after a time.
+
+    A sync pages through the changed lists, the changed tasks and then the
+    deletions (see `CHANGES_SECTIONS`), each in the order of their update
+    time and id. A page holds at most `limit` changes.
+
+    Returns the changes, the point in time to pass as `since` once the
+    sync is complete, and the `(section, after)` position of the next page
+    (None if the sync is complete). The point in time is `lag` seconds
+    before the start of the sync, so that changes made by transactions
+    still running then are returned by the next sync. Changes made in the
+    last `lag` seconds are thus returned twice.
+
+    Raises a 410 error if `since` is older than `retention`: tombstones
+    of deletions made since then may have been pruned.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.Session
+    limit : int
+    since : datetime, optional
+        UTC time of the previous sync. If None, all lists and tasks are
+        returned.
+    lag : float, optional
+        Should be longer than write transactions.
+    retention : timedelta, optional
+        How long tombstones are kept, see `record_deletions()`.
+    next_since : datetime, optional
+        Returned by the first page of the sync, for its next pages.
+    section : int, optional
+        Position returned along with the previous page of the sync.
+    after : str, optional
+        Position returned along with the previous page of the sync.
+    """
+    now = session.execute(select([utc_now()])).scalar()
+    if (since is not None and retention is not None
+            and since < now - retention):
+        raise falcon.HTTPGone(
+            description='Deletions this old are forgotten: sync again '
+                        'without a cursor.')
+    if next_since is None:
+        next_since = now - timedelta(seconds=lag)
+        if since is not None:
+            next_since = max(next_since, since)
+    changes = {
+        'lists': [],
+        'tasks': [],
+        'deleted': {'lists': [], 'tasks': []},
+    }
+    sections = _changes_sections(session, since, changes)
+    while section < len(sections):
+        query, keys, add = sections[section]
+        if query is not None:
+            if not limit:
+                return changes, next_since, (section, after)
+            rows, after = paginate(query, keys, limit=limit, after=after,
+                                   nulls=False, param='since')
+            for row in rows:
+                add(row)
+            if after is not None:
+                return changes, next_since, (section, after)
+            limit -= len(rows)
+        section += 1
+    return changes, next_since, None
+
+
+def load_list_detail_orm(session, id: int) -> dict:
+    """Load a list and its tasks through the ORM (one query per level)."""
+    return get_or_404(session, List, id=id).serialized
+
+
+def load_list_detail(session, id: int) -> dict:
+    """Load a list and its tasks using two fixed column queries.
+
+    Raises a 404 error if the list does not exist.
+    """
+    list_row = session.query(*LIST_COLUMNS).filter(List.id == id).first()
+    if list_row is None:
+        raise falcon.HTTPNotFound()
+    task_rows = (session.query(*TASK_COLUMNS)
+                 .filter(Task.list_id == id)
+                 .order_by(Task.id))
+    return {
+        **List.serialize_row(list_row),
+        'tasks': [Task.serialize_row(row) for row in task_rows],
+    }
+
+
+LIST_DETAIL_LOADERS = {
+    'orm': load_list_detail_orm,
+    'projection': load_list_detail,
+}
@@ -1,9 +1,22 @@
 """API resources definitions."""
 
+from datetime import timedelta
+from functools import partial
+
 import falcon
-import dateutil.parser
-from models import List, Task
-from utils import remove_empty, get_or_404
+from sqlalchemy import Column, DateTime, Integer, String, and_, func
+from helpers import paginate_request
+from helpers.events import (EVENT_STREAM_CONTENT_TYPE, TooManySubscribers,
+                            stream_events)
+from helpers.metrics import PROMETHEUS_CONTENT_TYPE
+from helpers.pagination import (NEXT_CURSOR_HEADER, encode_cursor,
+                                decode_cursor)
+from helpers.streaming import stream_json_array
+from models import List, Task, LIST_COLUMNS, TASK_COLUMNS
+from queries import (LIST_DETAIL_LOADERS, get_list_validators, touch_lists,
+                     record_deletions, load_changes, CHANGES_SECTIONS)
+from utils import (remove_empty, get_or_404, get_field, get_last_modified,
+                   is_not_modified, parse_datetime)
 
 
 def read_datetime(raw_datetime: str):
@@ -13,17 +26,144 @@ def read_datetime(raw_datetime: str):
     """
     if raw_datetime:
         try:
-            return dateutil.parser.parse(raw_datetime)
+            return parse_datetime(raw_datetime)
         except ValueError as e:
             raise falcon.HTTPBadRequest(description=str(e))
     return None
 
 
-class ListResource:
+def get_json_object(request) -> dict:
+    """Return the JSON object of a request body, or raise a 400 error."""
+    payload = getattr(request, 'json', None)
+    if not isinstance(payload, dict):
+        raise falcon.HTTPBadRequest(
+            'Validation error', 'Expected a JSON object.')
+    return payload
+
+
+def read_optional(get, field: str, dtype):
+    """Read a field which may be missing or null, else of type `dtype`."""
+    if get(field, default=None) is None:
+        return None
+    return get(field, dtype=dtype)
+
+
+def check_title(title: str) -> str:
+    """Return a task title, or raise a 400 error if it is too long."""
+    max_length = Task.title.type.length
+    if len(title) > max_length:
+        raise falcon.HTTPBadRequest(
+            'Validation error',
+            "Maximum length for 'title' is '{}'".format(max_length))
+    return title
+
+
+def read_task(get) -> dict:
+    """Read the fields of a new task.
+
+    Parameters
+    ----------
+    get : callable
+        A `request.get_json`-like getter of JSON fields.
+    """
+    return {
+        'title': check_title(get('title', dtype=str)),
+        'list_id': get('list_id'),
+        'due_date': read_datetime(get('due_date', default=None)),
+        'completed': get('completed', dtype=bool, default=False),
+        'priority': get('priority', dtype=int, default=0),
+    }
+
+
+def read_task_update(get) -> dict:
+    """Read the updated fields of a task, leaving out missing ones.
+
+    Parameters
+    ----------
+    get : callable
+        A `request.get_json`-like getter of JSON fields.
+    """
+    title = read_optional(get, 'title', str)
+    if title is not None:
+        check_title(title)
+    return remove_empty({
+        'title': title,
+        'due_date': read_datetime(get('due_date', default=None)),
+        'completed': read_optional(get, 'completed', bool),
+        'priority': read_optional(get, 'priority', int),
+    })
+
+
+def read_task_filter(get) -> list:
+    """Read conditions selecting tasks.
+
+    Parameters
+    ----------
+    get : callable
+        A `request.get_json`-like getter of JSON fields.
+    """
+    conditions = []
+    ids = get('ids', dtype=list, default=None)
+    if ids is not None:
+        if not ids or any(type(id) is not int for id in ids):
+            raise falcon.HTTPBadRequest(
+                'Validation error', "'ids' must be a non-empty array of int.")
+        conditions.append(Task.id.in_(ids))
+    list_id = get('list_id', dtype=int, default=None)
+    if list_id is not None:
+        conditions.append(Task.list_id == list_id)
+    completed = get('completed', dtype=bool, default=None)
+    if completed is not None:
+        conditions.append(Task.completed == completed)
+    return conditions
+
+
+def publish_task_events(events, event_type: str, tasks):
+    """Publish events about tasks, on the channels of their lists.
+
+    Parameters
+    ----------
+    events : helpers.events.Broker
+    event_type : str
+        'task.created', 'task.updated' or 'task.deleted'.
+    tasks : list of dict
+        Serialized tasks, or at least their `id` and `list_id`.
+    """
+    events.publish_many([
+        (task['list_id'], {'type': event_type, 'task': task})
+        for task in tasks
+    ])
+
+
+class StreamingMixin:
+    """Stream query results as JSON arrays."""
+
+    def stream(self, query, serialize, **kwargs):
+        """Return a generator streaming the rows of an ORM query.
+
+        Rows are read from the database of the request's session, e.g. a
+        replica.
+        """
+        return stream_json_array(
+            self.session.get_bind(), query.statement, serialize, self.dumps,
+            batch_size=self.settings.STREAM_BATCH_SIZE, **kwargs)
+
+
+class ListResource(StreamingMixin):
     """Manipulate task lists."""
 
     def on_get(self, request, response):
-        """Retrieve all lists.
+        """Retrieve lists, ordered by ID.
+
+        Query parameters:
+
+        - limit: int, optional (default: `PAGE_SIZE` setting)
+            Maximum number of lists to return.
+        - after: str, optional
+            Cursor of the page to return, as sent in the `X-Next-Cursor`
+            header of the previous page.
+        - stream: bool, optional (default: false)
+            If true, stream all lists instead of returning a page.
 
         Example response:
 
@@ -40,9 +180,19 @@ class ListResource:
         ]
         ```
         """
-        lists = self.session.query(List).all()
-        json = [list.serialized_simple for list in lists]
-        response.json = json
+        if request.get_param_as_bool('stream'):
+            query = self.session.query(*LIST_COLUMNS).order_by(List.id)
+            response.stream = self.stream(query, List.serialize_row)
+            return
+
+        def render(response):
+            query = self.session.query(*LIST_COLUMNS)
+            rows = paginate_request(request, response, query,
+                                    keys=[List.id], settings=self.settings)
+            response.json = [List.serialize_row(row) for row in rows]
+
+        key = ('lists', request.get_param('limit'), request.get_param('after'))
+        self.cache.serve(key, response, render, headers=[NEXT_CURSOR_HEADER])
 
     def on_post(self, request, response):
         """Create a new list.
@@ -53,18 +203,64 @@ class ListResource:
             Title of the list.
         """
         title = request.get_json('title', dtype=str)
-        list_ = List(title=title)
+        # A new list has no tasks: don't lazy-load them when serializing.
+        list_ = List(title=title, tasks=[])
         self.session.add(list_)
         self.session.commit()
+        self.cache.clear('lists')
         response.status = falcon.HTTP_201
         response.json = list_.serialized
 
 
-class ListDetailResource:
-    """Manipulate a task list."""
+class ListStatsResource:
+    """Count the tasks of lists."""
+
+    def on_get(self, request, response):
+        """Retrieve task counts of lists, ordered by list ID.
+
+        Counts of all lists are computed by a single grouped query. Accepts
+        the same pagination parameters as `GET /lists`.
+
+        Example response:
+
+        ```
+        [
+            {
+                "list_id": 2,
+                "open": 3,
+                "done": 5,
+                "overdue": 1
+            }
+        ]
+        ```
+
+        Overdue tasks are open tasks whose due date is past.
+        """
+        open_ = Task.completed.is_(False)
+        overdue = and_(open_, Task.due_date < func.localtimestamp())
+        counts = (
+            func.count(Task.id).filter(open_).label('open'),
+            func.count(Task.id).filter(~open_).label('done'),
+            func.count(Task.id).filter(overdue).label('overdue'),
+        )
+        query = (self.session.query(List.id, *counts)
+                 .outerjoin(Task, Task.list_id == List.id)
+                 .group_by(List.id))
+        rows = paginate_request(request, response, query, keys=[List.id],
+                                settings=self.settings)
+        response.json = [
+            {
+                'list_id': row.id,
+                'open': row.open,
+                'done': row.done,
+                'overdue': row.overdue,
+            }
+            for row in rows
+        ]
 
-    def get_object(self, id: int) -> List:
-        return get_or_404(self.session, List, id=id)
+
+class ListDetailResource(StreamingMixin):
+    """Manipulate a task list."""
 
     def on_get(self, request, response, id: int):
         """Retrieve a list and its tasks.
@@ -87,18 +283,170 @@ class ListDetailResource:
             ]
         }
         ```
+
+        The loading strategy is chosen by the `LIST_DETAIL_LOADER` setting.
+        If the `stream` query parameter is true, tasks are streamed instead.
+
+        Supports conditional requests: the response has `ETag` and
+        `Last-Modified` headers, and is a 304 Not Modified (without loading
+        tasks) if the `If-None-Match` or `If-Modified-Since` header shows
+        that the client's copy is up to date. The ETag takes precedence.
+        `Last-Modified` is only sent for lists modified at least a second
+        before the response.
         """
-        list_ = self.get_object(id)
-        response.json = list_.serialized
+        if request.get_param_as_bool('stream'):
+            self.on_get_stream(request, response, id)
+            return
+
+        key = ('list', id)
+        generation = self.cache.generation
+        entry = self.cache.get(key)
+        if entry is None:
+            validators = get_list_validators(self.session, id)
+        else:
+            json, validators = entry
+
+        response.etag = validators[0]
+        response.last_modified = get_last_modified(validators[1])
+        if is_not_modified(request, *validators):
+            response.status = falcon.HTTP_304
+            return
+
+        if entry is None:
+            load = LIST_DETAIL_LOADERS[self.settings.LIST_DETAIL_LOADER]
+            json = load(self.session, id)
+            self.cache.set(key, (json, validators), generation)
+        response.json = json
+
+    def on_get_stream(self, request, response, id: int):
+        list_row = (self.session.query(*LIST_COLUMNS)
+                    .filter(List.id == id)
+                    .first())
+        if list_row is None:
+            raise falcon.HTTPNotFound()
+        query = (self.session.query(*TASK_COLUMNS)
+                 .filter(Task.list_id == id)
+                 .order_by(Task.id))
+        # Output the list's fields, then the array of tasks.
+        prefix = self.dumps(List.serialize_row(list_row))[:-1] + b',"tasks":'
+        response.stream = self.stream(query, Task.serialize_row,
+                                      prefix=prefix, suffix=b'}')
 
     def on_delete(self, request, response, id):
-        """Delete a list."""
-        list_ = self.get_object(id)
-        self.session.delete(list_)
+        """Delete a list.
+
+        Its tasks are deleted by the database (`ON DELETE CASCADE`).
+        """
+        deleted = (self.session.query(List)
+                   .filter(List.id == id)
+                   .delete(synchronize_session=False))
+        if not deleted:
+            raise falcon.HTTPNotFound()
+        retention = timedelta(days=self.settings.CHANGES_RETENTION)
+        record_deletions(self.session, 'list', [id], retention=retention)
         self.session.commit()
+        self.cache.clear('lists')
+        self.cache.invalidate('list', id)
+        # Ends the event streams of the list.
+        self.events.publish(id, {'type': 'list.deleted', 'list': {'id': id}})
         response.status = falcon.HTTP_204
 
 
+class ListTasksResource:
+    """Browse the tasks of a list."""
+
+    # Ordering keys of tasks, ending with the ID to make them unique.
+    orderings = {
+        'id': [Task.id],
+        'priority': [Task.priority.desc(), Task.id],
+        'due_date': [Task.due_date, Task.id],
+    }
+
+    def on_get(self, request, response, id: int):
+        """Retrieve the tasks of a list.
+
+        Accepts the same pagination parameters as `GET /lists`, and:
+
+        - completed: bool, optional
+            Only return completed (or not completed) tasks.
+        - due_before: str, optional
+            ISO date-time: only return tasks due strictly before it.
+        - order: str, optional (default: 'id')
+            One of 'id', 'priority' (most important first) or 'due_date'
+            (earliest first, then tasks without a due date).
+        """
+        order = request.get_param('order', default='id')
+        if order not in self.orderings:
+            raise falcon.HTTPInvalidParam(
+                'Expected one of {}.'.format(sorted(self.orderings)), 'order')
+
+        query = self.session.query(*TASK_COLUMNS).filter(Task.list_id == id)
+        completed = request.get_param_as_bool('completed')
+        if completed is not None:
+            query = query.filter(Task.completed == completed)
+        due_before = read_datetime(request.get_param('due_before'))
+        if due_before is not None:
+            query = query.filter(Task.due_date < due_before)
+
+        rows = paginate_request(request, response, query,
+                                keys=self.orderings[order],
+                                settings=self.settings)
+        if not rows:
+            # Only check that the list exists when there is nothing to show.
+            get_or_404(self.session, List, id=id)
+        response.json = [Task.serialize_row(row) for row in rows]
+
+
+class ListEventsResource:
+    """Follow the changes of the tasks of a list."""
+
+    def on_get(self, request, response, id: int):
+        """Subscribe to the changes of the tasks of a list.
+
+        The response is a Server-Sent Events stream, e.g.:
+
+        ```
+        event: task.updated
+        data: {"task": {"id": 2, "list_id": 1, "title": "Buy bread", ...}}
+
+        event: task.deleted
+        data: {"task": {"id": 3, "list_id": 1}}
+
+        event: list.deleted
+        data: {"list": {"id": 1}}
+        ```
+
+        Event types are `task.created`, `task.updated`, `task.deleted` and
+        `list.deleted`, which ends the stream (the tasks of the list get no
+        event of their own). Comments are sent every `EVENTS_KEEPALIVE`
+        seconds without events. Apart from checking that the list exists,
+        no queries are made.
+
+        A worker process serves at most `EVENTS_MAX_STREAMS` streams at
+        once: beyond that, a 503 error is returned.
+        """
+        try:
+            subscription = self.events.subscribe(id)
+        except TooManySubscribers:
+            raise falcon.HTTPServiceUnavailable(
+                description='Too many event streams are open.')
+        try:
+            # After subscribing, not to miss the deletion of the list.
+            get_list_validators(self.session, id)
+        except Exception:
+            subscription.close()
+            raise
+        response.content_type = EVENT_STREAM_CONTENT_TYPE
+        response.set_headers({
+            'Cache-Control': 'no-cache',
+            # Ask proxies (e.g. nginx) to forward events immediately.
+            'X-Accel-Buffering': 'no',
+        })
+        response.stream = stream_events(
+            subscription, self.dumps, keepalive=self.settings.EVENTS_KEEPALIVE,
+            end_on=('list.deleted',))
+
+
 class TaskResource:
     """Manipulate tasks."""
 
@@ -130,36 +478,154 @@ class TaskResource:
         }
         ```
         """
-        title = request.get_json('title')
-        list_id = request.get_json('list_id')
-        due_date = request.get_json('due_date', default=None)
-        completed = request.get_json('completed', dtype=bool, default=False)
-        priority = request.get_json('priority', dtype=int, default=0)
+        fields = read_task(request.get_json)
+        list_id = fields['list_id']
+
+        get_or_404(self.session, List, id=list_id)
 
-        due_date = read_datetime(due_date)
+        # Serialize the stored row, e.g. the due date converted to UTC.
+        statement = (Task.__table__.insert()
+                     .values(fields)
+                     .returning(*TASK_COLUMNS))
+        task = Task.serialize_row(self.session.execute(statement).first())
+        touch_lists(self.session, [list_id])
+        self.session.commit()
+        self.cache.invalidate('list', list_id)
+        publish_task_events(self.events, 'task.created', [task])
+
+        response.status = falcon.HTTP_201
+        response.json = task
+
+
+class TaskBulkResource:
+    """Manipulate many tasks at once."""
 
-        list_ = get_or_404(self.session, List, id=list_id)
+    def on_post(self, request, response):
+        """Create tasks in a single statement.
 
-        task = Task(
-            title=title,
-            list=list_,
-            due_date=due_date,
-            completed=completed,
-            priority=priority)
+        The payload is an array of task objects, accepting the same fields
+        as `POST /tasks`. All tasks are created, or none if any is invalid
+        or refers to a list that does not exist. The description of the 400
+        error of an invalid task starts with its index, e.g. "Task 3: ...".
 
-        self.session.add(task)
+        The response is the array of created tasks, in the payload order.
+        """
+        payload = getattr(request, 'json', None)
+        if not isinstance(payload, list) or not payload:
+            raise falcon.HTTPBadRequest(
+                'Validation error', 'Expected a non-empty array of tasks.')
+        if len(payload) > self.settings.BULK_MAX_SIZE:
+            raise falcon.HTTPBadRequest(
+                'Validation error', 'At most {} tasks can be created at once.'
+                .format(self.settings.BULK_MAX_SIZE))
+
+        rows = []
+        for index, item in enumerate(payload):
+            try:
+                if not isinstance(item, dict):
+                    raise falcon.HTTPBadRequest(
+                        'Validation error', 'Tasks must be JSON objects.')
+                get_field(item, 'list_id', dtype=int)
+                rows.append(read_task(partial(get_field, item)))
+            except falcon.HTTPBadRequest as error:
+                # Tell the client which task is invalid.
+                raise falcon.HTTPBadRequest(
+                    error.title,
+                    'Task {}: {}'.format(index, error.description))
+
+        list_ids = {row['list_id'] for row in rows}
+        existing = {id for id, in self.session.query(List.id)
+                    .filter(List.id.in_(list_ids))}
+        missing = list_ids - existing
+        if missing:
+            raise falcon.HTTPNotFound(description='Unknown list IDs: {}'
+                                      .format(sorted(missing)))
+
+        statement = (Task.__table__.insert()
+                     .values(rows)
+                     .returning(*TASK_COLUMNS))
+        created = [Task.serialize_row(row)
+                   for row in self.session.execute(statement)]
+        touch_lists(self.session, list_ids)
         self.session.commit()
+        for list_id in list_ids:
+            self.cache.invalidate('list', list_id)
+        publish_task_events(self.events, 'task.created', created)
 
         response.status = falcon.HTTP_201
-        response.json = task.serialized
+        response.json = created
+
+    def on_patch(self, request, response):
+        """Update all tasks matching a filter in a single statement.
+
+        Payload parameters:
+
+        filter: object, required
+            Tasks to update. At least one of:
+            - ids: list of int
+            - list_id: int
+            - completed: bool
+        update: object, required
+            Fields to update, as accepted by `PATCH /tasks/{id}`.
+
+        Example payload:
+        ```
+        {
+            "filter": {"list_id": 2, "completed": false},
+            "update": {"completed": true}
+        }
+        ```
+
+        Example response:
+        ```
+        {
+            "updated": 1,
+            "tasks": [
+                {
+                    "id": 1,
+                    "list_id": 2,
+                    "title": "Buy groceries",
+                    "due_date": null,
+                    "completed": true,
+                    "priority": 0
+                }
+            ]
+        }
+        ```
+        """
+        payload = get_json_object(request)
+        conditions = read_task_filter(
+            partial(get_field, get_field(payload, 'filter', dtype=dict)))
+        if not conditions:
+            raise falcon.HTTPBadRequest(
+                'Validation error', 'At least one filter is required.')
+        cleaned_fields = read_task_update(
+            partial(get_field, get_field(payload, 'update', dtype=dict)))
+        if not cleaned_fields:
+            raise falcon.HTTPBadRequest(
+                'Validation error', 'At least one field must be updated.')
+
+        statement = (Task.__table__.update()
+                     .where(and_(*conditions))
+                     .values(cleaned_fields)
+                     .returning(*TASK_COLUMNS))
+        tasks = [Task.serialize_row(row)
+                 for row in self.session.execute(statement)]
+        list_ids = {task['list_id'] for task in tasks}
+        if list_ids:
+            touch_lists(self.session, list_ids)
+        self.session.commit()
+        for list_id in list_ids:
+            self.cache.invalidate('list', list_id)
+        publish_task_events(self.events, 'task.updated', tasks)
+
+        response.status = falcon.HTTP_200
+        response.json = {'updated': len(tasks), 'tasks': tasks}
 
 
 class TaskDetailResource:
     """Manipulate a task."""
 
-    def get_object(self, id: int) -> Task:
-        return get_or_404(self.session, Task, id=id)
-
     def on_patch(self, request, response, id: int):
         """(Partially) update a task.
 
@@ -173,32 +639,227 @@ class TaskDetailResource:
         - completed: bool
         - priority: int
         """
-        task = self.get_object(id)
-
-        due_date = request.get_json('due_date', default=None)
-        due_date = read_datetime(due_date)
-
-        updated_fields = {
-            'title': request.get_json('title', default=None),
-            'due_date': due_date,
-            'completed': request.get_json('completed', default=None),
-            'priority': request.get_json('priority', default=None),
-        }
-
-        cleaned_fields = remove_empty(updated_fields)
+        cleaned_fields = read_task_update(
+            partial(get_field, get_json_object(request)))
 
         if cleaned_fields:
-            for field, value in cleaned_fields.items():
-                setattr(task, field, value)
-            self.session.add(task)
+            statement = (Task.__table__.update()
+                         .where(Task.id == id)
+                         .values(cleaned_fields)
+                         .returning(*TASK_COLUMNS))
+            row = self.session.execute(statement).first()
+            if row is not None:
+                touch_lists(self.session, [row.list_id])
             self.session.commit()
+            if row is not None:
+                self.cache.invalidate('list', row.list_id)
+                publish_task_events(self.events, 'task.updated',
+                                    [Task.serialize_row(row)])
+        else:
+            row = (self.session.query(*TASK_COLUMNS)
+                   .filter(Task.id == id)
+                   .first())
+
+        if row is None:
+            raise falcon.HTTPNotFound()
 
         response.status = falcon.HTTP_200
-        response.json = task.serialized
+        response.json = Task.serialize_row(row)
 
     def on_delete(self, request, response, id: int):
         """Delete a task."""
-        task = self.get_object(id)
-        self.session.delete(task)
+        statement = (Task.__table__.delete()
+                     .where(Task.id == id)
+                     .returning(Task.list_id))
+        row = self.session.execute(statement).first()
+        if row is None:
+            raise falcon.HTTPNotFound()
+        touch_lists(self.session, [row.list_id])
+        retention = timedelta(days=self.settings.CHANGES_RETENTION)
+        record_deletions(self.session, 'task', [id], retention=retention)
         self.session.commit()
+        self.cache.invalidate('list', row.list_id)
+        publish_task_events(self.events, 'task.deleted',
+                            [{'id': id, 'list_id': row.list_id}])
         response.status = falcon.HTTP_204
+
+
+class AgendaResource:
+    """Browse open tasks by due date, across lists."""
+
+    def on_get(self, request, response):
+        """Retrieve open tasks due in a time window, earliest first.
+
+        Query parameters:
+
+        - start: str, optional (default: now)
+            ISO date-time of the start of the window (inclusive).
+        - end: str, optional (default: `AGENDA_DAYS` days after start)
+            ISO date-time of the end of the window (exclusive).
+
+        Accepts the same pagination parameters as `GET /lists`.
+        """
+        start = read_datetime(request.get_param('start'))
+        if start is None:
+            start = func.localtimestamp()
+        end = read_datetime(request.get_param('end'))
+        if end is None:
+            end = start + timedelta(days=self.settings.AGENDA_DAYS)
+
+        query = (self.session.query(*TASK_COLUMNS)
+                 .filter(~Task.completed,
+                         Task.due_date >= start,
+                         Task.due_date < end))
+        # Due dates in the window are not NULL.
+        rows = paginate_request(request, response, query,
+                                keys=[Task.due_date, Task.id],
+                                settings=self.settings, nulls=False)
+        response.json = [Task.serialize_row(row) for row in rows]
+
+
+class ChangesResource:
+    """Synchronize lists and tasks incrementally."""
+
+    # Values of the cursors, see `load_changes()`: the `since` time of the
+    # sync, and the position of its next page (while it is not complete).
+    cursor_columns = (
+        Column('since', DateTime(), nullable=True),
+        Column('next_since', DateTime(), nullable=True),
+        Column('section', Integer(), nullable=False),
+        Column('after', String(), nullable=True),
+    )
+
+    def on_get(self, request, response):
+        """Retrieve the lists and tasks changed or deleted since a cursor.
+
+        Query parameters:
+
+        - since: str, optional
+            The `cursor` of the previous response. If omitted, all lists
+            and tasks are returned.
+        - limit: int, optional (default: `PAGE_SIZE`)
+            Maximum number of changes in the response.
+
+        Example response:
+
+        ```
+        {
+            "lists": [{"id": 1, "title": "Shopping", "archived": false}],
+            "tasks": [
+                {
+                    "id": 2,
+                    "list_id": 1,
+                    "title": "Buy bread",
+                    "due_date": null,
+                    "completed": true,
+                    "priority": 0
+                }
+            ],
+            "deleted": {"lists": [3], "tasks": [12, 14]},
+            "cursor": "WyIyMDE4LTA0LTAzVDIzOjQ3OjI1IixudWxsLDAsbnVsbF0",
+            "more": false
+        }
+        ```
+
+        While `more` is true, the changes are paged: get the next page
+        right away with the returned cursor. Once it is false, the client
+        is in sync, and the cursor is the one of the next sync.
+
+        The same change may be returned by consecutive syncs, for
+        `CHANGES_LAG` seconds. The tasks of a deleted list are not listed
+        in `deleted`. Deletions are kept for `CHANGES_RETENTION` days: a
+        cursor older than that gets a 410 error, and the client must sync
+        again without a cursor.
+        """
+        limit = request.get_param_as_int(
+            'limit', min=1, max=self.settings.MAX_PAGE_SIZE
+        ) or self.settings.PAGE_SIZE
+        since, next_since, section, after = None, None, 0, None
+        cursor = request.get_param('since')
+        if cursor is not None:
+            since, next_since, section, after = decode_cursor(
+                cursor, self.cursor_columns, param='since')
+            if not 0 <= section < len(CHANGES_SECTIONS):
+                raise falcon.HTTPInvalidParam('Malformed cursor.', 'since')
+        changes, next_since, position = load_changes(
+            self.session, limit, since=since, lag=self.settings.CHANGES_LAG,
+            retention=timedelta(days=self.settings.CHANGES_RETENTION),
+            next_since=next_since, section=section, after=after)
+        if position is None:
+            # Complete: the next sync starts from `next_since`.
+            cursor = [next_since, None, 0, None]
+        else:
+            cursor = [since, next_since, *position]
+        response.json = {
+            **changes,
+            'cursor': encode_cursor(cursor),
+            'more': position is not None,
+        }
+
+
+class StatusResource:
+    """Expose runtime statistics of the app."""
+
+    def on_get(self, request, response):
+        """Retrieve statistics.
+
+        Example response:
+
+        ```
+        {
+            "pool": {
+                "size": 5,
+                "checked_in": 1,
+                "checked_out": 0,
+                "overflow": 0,
+                "checkouts": 42,
+                "timeouts": 0,
+                "wait_total": 0.0021,
+                "wait_max": 0.0003
+            },
+            "cache": {
+                "size": 12,
+                "hits": 120,
+                "misses": 30
+            },
+            "sessions": {
+                "requests": 150,
+                "created": 80
+            },
+            "events": {
+                "channels": 3,
+                "subscribers": 4
+            },
+            "replicas": {
+                "count": 2,
+                "down": 0,
+                "reads": 60,
+                "failures": 0
+            }
+        }
+        ```
+
+        Statistics are those of the current worker process. Replicas are
+        only listed if configured.
+        """
+        response.json = {
+            'pool': self.engine.pool.stats(),
+            'cache': self.cache.stats(),
+            'sessions': self.session_manager.stats(),
+            'events': self.events.stats(),
+        }
+        replicas = self.session_manager.replicas
+        if replicas is not None:
+            response.json['replicas'] = replicas.stats()
+
+
+class MetricsResource:
+    """Expose request and database metrics to Prometheus."""
+
+    def on_get(self, request, response):
+        """Retrieve metrics in the Prometheus text format.
+
+        Metrics are those of the current worker process.
+        """
+        response.content_type = PROMETHEUS_CONTENT_TYPE
+        response.body = self.metrics.render()
@@ -5,7 +5,15 @@ import resources
 
 routes = {
     '/lists': resources.ListResource(),
+    '/lists/stats': resources.ListStatsResource(),
     '/lists/{id:int}': resources.ListDetailResource(),
+    '/lists/{id:int}/tasks': resources.ListTasksResource(),
+    '/lists/{id:int}/events': resources.ListEventsResource(),
     '/tasks/': resources.TaskResource(),
+    '/tasks/bulk': resources.TaskBulkResource(),
     '/tasks/{id:int}': resources.TaskDetailResource(),
+    '/agenda': resources.AgendaResource(),
+    '/changes': resources.ChangesResource(),
+    '/status': resources.StatusResource(),
+    '/metrics': resources.MetricsResource(),
 }
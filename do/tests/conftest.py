@@ -6,7 +6,7 @@ import pytest
 from falcon.testing import TestClient as Client
 
 from do import app
-from helpers.db import apply_migrations
+from helpers.db import apply_migrations, get_session_factory
 from helpers.settings import load_settings
 
 
@@ -63,7 +63,15 @@ def task_payload(now):
     return {
         'title': 'Eat donuts',
         'list_id': 1,
-        'due_date': str(now),
+        'due_date': now.isoformat(),
         'priority': 2,
         'completed': False,
     }
+
+
+@pytest.fixture()
+def session(settings, database):
+    """Provide a database session bound to the test database."""
+    session = get_session_factory(settings.DATABASE_BACKEND.url)()
+    yield session
+    session.close()
@@ -82,7 +82,7 @@ def test_create_task(client: Client, task_payload, omitted, id):
 ])
 def test_update_task(client: Client, now, key, value):
     if key == 'due_date':
-        value = str(now)
+        value = now.isoformat()
     payload = key and {key: value} or {}
     result = client.simulate_patch('/tasks/1', json=payload)
     assert result.status_code == 200, result.json
@@ -111,6 +111,26 @@ def test_deleted_list_not_found(client: Client):
     assert result.status_code == 404
 
 
+@pytest.mark.parametrize('payload', [
+    {'title': 'x' * 251},
+    {'priority': '1'},
+    {'completed': 1},
+])
+def test_update_task_bad_request(client: Client, payload):
+    result = client.simulate_patch('/tasks/2', json=payload)
+    assert result.status_code == 400
+
+
+def test_update_task_no_body(client: Client):
+    assert client.simulate_patch('/tasks/2').status_code == 400
+
+
+@pytest.mark.parametrize('payload', [{}, {'completed': True}])
+def test_deleted_list_tasks_deleted(client: Client, payload):
+    result = client.simulate_patch('/tasks/2', json=payload)
+    assert result.status_code == 404
+
+
 @pytest.mark.parametrize('resource', ['tasks', 'lists'])
 def test_delete_task_or_list_not_found(client: Client, resource):
     result = client.simulate_delete('/{}/1'.format(resource))
@@ -125,3 +145,16 @@ def test_list_detail_not_found(client: Client):
 def test_list_detail_non_int_id_not_found(client: Client):
     result = client.simulate_get('/lists/abcd')
     assert result.status_code == 404
+
+
+def test_create_task_due_date_with_offset(client: Client):
+    result = client.simulate_post('/lists', json={'title': 'Offset'})
+    list_id = result.json['id']
+    result = client.simulate_post('/tasks', json={
+        'title': 'Call', 'list_id': list_id,
+        'due_date': '2018-04-03T10:00:00+02:00'})
+    assert result.status_code == 201, result.json
+    # As stored, i.e. in UTC, and as returned by other endpoints.
+    assert result.json['due_date'] == '2018-04-03T08:00:00'
+    tasks = client.simulate_get('/lists/{}'.format(list_id)).json['tasks']
+    assert tasks == [result.json]
@@ -0,0 +1,117 @@
+"""Bulk task operations tests."""
+
+import pytest
+from falcon.testing import TestClient as Client
+
+
+@pytest.fixture()
+def list_id(client: Client, list_title):
+    """Create an empty list and return its ID."""
+    result = client.simulate_post('/lists', json={'title': list_title})
+    return result.json['id']
+
+
+def test_bulk_create_tasks(client: Client, list_id, task_payload):
+    payload = [
+        {**task_payload, 'list_id': list_id, 'title': str(i)}
+        for i in range(3)
+    ]
+    payload[0].pop('due_date')
+    result = client.simulate_post('/tasks/bulk', json=payload)
+    assert result.status_code == 201, result.json
+    assert [task['title'] for task in result.json] == ['0', '1', '2']
+    assert result.json[0]['due_date'] is None
+    assert result.json[1]['due_date'] == task_payload['due_date']
+
+    result = client.simulate_get('/lists/{}'.format(list_id))
+    assert len(result.json['tasks']) == 3
+
+
+@pytest.mark.parametrize('payload', [
+    [], {}, [1], [{'list_id': 1}], [{'title': 'Eat donuts', 'list_id': '1'}],
+])
+def test_bulk_create_tasks_bad_request(client: Client, payload):
+    result = client.simulate_post('/tasks/bulk', json=payload)
+    assert result.status_code == 400
+
+
+@pytest.mark.parametrize('title', [None, 42, ['a'], 'a' * 251])
+def test_bulk_create_tasks_invalid_title(client: Client, list_id,
+                                         task_payload, title):
+    payload = [{**task_payload, 'list_id': list_id} for _ in range(3)]
+    payload[1]['title'] = title
+    result = client.simulate_post('/tasks/bulk', json=payload)
+    assert result.status_code == 400
+    assert result.json['description'].startswith('Task 1: ')
+
+    result = client.simulate_get('/lists/{}'.format(list_id))
+    assert result.json['tasks'] == []
+
+
+def test_bulk_create_tasks_list_not_found(client: Client, list_id,
+                                          task_payload):
+    payload = [
+        {**task_payload, 'list_id': list_id},
+        {**task_payload, 'list_id': 123456789},
+    ]
+    result = client.simulate_post('/tasks/bulk', json=payload)
+    assert result.status_code == 404
+
+    result = client.simulate_get('/lists/{}'.format(list_id))
+    assert result.json['tasks'] == []
+
+
+@pytest.fixture()
+def task_ids(client: Client, list_id, task_payload):
+    """Create 3 tasks in the list and return their IDs."""
+    payload = [{**task_payload, 'list_id': list_id} for _ in range(3)]
+    result = client.simulate_post('/tasks/bulk', json=payload)
+    return [task['id'] for task in result.json]
+
+
+def test_bulk_update_tasks_by_ids(client: Client, task_ids):
+    payload = {'filter': {'ids': task_ids[:2]}, 'update': {'priority': 5}}
+    result = client.simulate_patch('/tasks/bulk', json=payload)
+    assert result.status_code == 200, result.json
+    assert result.json['updated'] == 2
+    assert {task['id'] for task in result.json['tasks']} == set(task_ids[:2])
+    assert all(task['priority'] == 5 for task in result.json['tasks'])
+
+
+def test_bulk_complete_list(client: Client, list_id, task_ids):
+    client.simulate_patch('/tasks/{}'.format(task_ids[0]),
+                          json={'completed': True})
+    payload = {
+        'filter': {'list_id': list_id, 'completed': False},
+        'update': {'completed': True},
+    }
+    result = client.simulate_patch('/tasks/bulk', json=payload)
+    assert result.status_code == 200, result.json
+    assert result.json['updated'] == 2
+
+    result = client.simulate_get('/lists/{}'.format(list_id))
+    assert all(task['completed'] for task in result.json['tasks'])
+
+
+@pytest.mark.parametrize('payload', [
+    {},
+    {'filter': {}, 'update': {'completed': True}},
+    {'filter': {'ids': []}, 'update': {'completed': True}},
+    {'filter': {'ids': ['1']}, 'update': {'completed': True}},
+    {'filter': {'list_id': 1}, 'update': {}},
+    {'filter': {'list_id': 1}, 'update': {'due_date': 'not a date'}},
+    {'filter': {'list_id': 1}, 'update': {'priority': 'x'}},
+    {'filter': {'list_id': 1}, 'update': {'completed': 'yes'}},
+    {'filter': {'list_id': 1}, 'update': {'title': 1}},
+    {'filter': {'list_id': 1}, 'update': {'title': 'x' * 251}},
+    {'filter': [1], 'update': {'completed': True}},
+    [],
+])
+def test_bulk_update_tasks_bad_request(client: Client, payload):
+    result = client.simulate_patch('/tasks/bulk', json=payload)
+    assert result.status_code == 400
+
+
+def test_bulk_update_tasks_no_body(client: Client):
+    result = client.simulate_patch('/tasks/bulk')
+    assert result.status_code == 400
@@ -0,0 +1,128 @@
+"""Response cache tests."""
+
+import falcon
+import pytest
+from falcon.testing import TestClient as Client
+
+from do import app
+from helpers.cache import ResponseCache
+
+
+class Clock:
+    """Controllable clock."""
+
+    def __init__(self):
+        self.time = 0
+
+    def __call__(self):
+        return self.time
+
+
+@pytest.fixture()
+def clock():
+    return Clock()
+
+
+@pytest.fixture()
+def client(monkeypatch, settings, database) -> Client:
+    """Test client of an app caching responses."""
+    monkeypatch.setattr('settings.testing.CACHE_ENABLED', True)
+    return Client(app.create())
+
+
+def test_cache_expires(clock):
+    cache = ResponseCache(max_size=2, ttl=10, clock=clock)
+    cache.set(('list', 1), 'a')
+    assert cache.get(('list', 1)) == 'a'
+    clock.time = 10
+    assert cache.get(('list', 1)) is None
+    assert cache.stats() == {'size': 0, 'hits': 1, 'misses': 1}
+
+
+def test_cache_evicts_least_recently_used(clock):
+    cache = ResponseCache(max_size=2, ttl=10, clock=clock)
+    cache.set(('list', 1), 'a')
+    cache.set(('list', 2), 'b')
+    cache.get(('list', 1))
+    cache.set(('list', 3), 'c')
+    assert cache.get(('list', 2)) is None
+    assert cache.get(('list', 1)) == 'a'
+    assert cache.get(('list', 3)) == 'c'
+
+
+def test_cache_invalidation(clock):
+    cache = ResponseCache(max_size=10, ttl=10, clock=clock)
+    cache.set(('lists', None, None), 'a')
+    cache.set(('lists', '2', None), 'b')
+    cache.set(('list', 1), 'c')
+    cache.clear('lists')
+    assert cache.stats()['size'] == 1
+    cache.invalidate('list', 1)
+    assert cache.stats()['size'] == 0
+
+
+def test_cache_skips_values_read_before_invalidation(clock):
+    cache = ResponseCache(max_size=10, ttl=10, clock=clock)
+    generation = cache.generation
+    # A write invalidates the entry while the value is being read.
+    cache.invalidate('list', 1)
+    cache.set(('list', 1), 'stale', generation)
+    assert cache.get(('list', 1)) is None
+
+    generation = cache.generation
+    cache.set(('list', 1), 'fresh', generation)
+    assert cache.get(('list', 1)) == 'fresh'
+
+
+def test_cache_serve_skips_responses_read_during_a_write(clock):
+    cache = ResponseCache(max_size=10, ttl=10, clock=clock)
+    response = falcon.Response()
+
+    def render(response):
+        response.json = ['stale']
+        # Another thread handles a write before this response is cached.
+        cache.clear('lists')
+
+    cache.serve(('lists', None, None), response, render)
+    assert response.json == ['stale']
+    assert cache.get(('lists', None, None)) is None
+
+
+def test_disabled_cache(clock):
+    cache = ResponseCache(max_size=0, ttl=10, clock=clock)
+    cache.set(('list', 1), 'a')
+    assert cache.get(('list', 1)) is None
+
+
+def test_list_detail_cache_invalidated_by_writes(client: Client, list_title,
+                                                  task_payload):
+    result = client.simulate_post('/lists', json={'title': list_title})
+    url = '/lists/{}'.format(result.json['id'])
+    payload = {**task_payload, 'list_id': result.json['id']}
+
+    assert client.simulate_get(url).json['tasks'] == []
+    assert client.simulate_get(url).json['tasks'] == []
+    assert client.simulate_get('/status').json['cache']['hits'] == 1
+
+    task = client.simulate_post('/tasks', json=payload).json
+    assert client.simulate_get(url).json['tasks'] == [task]
+
+    task = client.simulate_patch('/tasks/{}'.format(task['id']),
+                                 json={'completed': True}).json
+    assert client.simulate_get(url).json['tasks'] == [task]
+
+    client.simulate_delete('/tasks/{}'.format(task['id']))
+    assert client.simulate_get(url).json['tasks'] == []
+
+    client.simulate_delete(url)
+    assert client.simulate_get(url).status_code == 404
+
+
+def test_lists_cache_invalidated_by_writes(client: Client, list_title):
+    ids = [list_['id'] for list_ in client.simulate_get('/lists').json]
+    result = client.simulate_post('/lists', json={'title': list_title})
+    new_ids = [list_['id'] for list_ in client.simulate_get('/lists').json]
+    assert new_ids == ids + [result.json['id']]
+
+    client.simulate_delete('/lists/{}'.format(result.json['id']))
+    assert [list_['id'] for list_ in client.simulate_get('/lists').json] == ids
@@ -0,0 +1,162 @@
+"""Delta sync tests."""
+
+from datetime import datetime
+
+import pytest
+from falcon.testing import TestClient as Client
+
+from do import app
+from helpers.pagination import encode_cursor
+from models import Deletion
+
+
+@pytest.fixture()
+def sync_client(monkeypatch, settings, database) -> Client:
+    monkeypatch.setattr('settings.testing.CHANGES_LAG', 0)
+    return Client(app.create())
+
+
+def sync(client: Client, cursor=None, **params) -> dict:
+    if cursor is not None:
+        params['since'] = cursor
+    result = client.simulate_get('/changes', params=params)
+    assert result.status_code == 200, result.json
+    return result.json
+
+
+def create_list(client: Client, title: str) -> int:
+    return client.simulate_post('/lists', json={'title': title}).json['id']
+
+
+def create_task(client: Client, list_id: int, title: str) -> int:
+    return client.simulate_post('/tasks/', json={
+        'title': title, 'list_id': list_id}).json['id']
+
+
+def test_full_sync(sync_client: Client):
+    list_id = create_list(sync_client, 'Full')
+    task_id = create_task(sync_client, list_id, 'Task')
+    changes = sync(sync_client)
+    assert list_id in {item['id'] for item in changes['lists']}
+    assert task_id in {task['id'] for task in changes['tasks']}
+    assert changes['deleted'] == {'lists': [], 'tasks': []}
+    assert changes['cursor']
+    assert changes['more'] is False
+
+
+def test_incremental_sync(sync_client: Client):
+    list_id = create_list(sync_client, 'Before')
+    kept_id = create_task(sync_client, list_id, 'Kept')
+    updated_id = create_task(sync_client, list_id, 'Updated')
+    deleted_id = create_task(sync_client, list_id, 'Deleted')
+    other_list_id = create_list(sync_client, 'Deleted list')
+    cursor = sync(sync_client)['cursor']
+
+    changes = sync(sync_client, cursor)
+    assert changes['lists'] == changes['tasks'] == []
+    assert changes['deleted'] == {'lists': [], 'tasks': []}
+
+    sync_client.simulate_patch('/tasks/{}'.format(updated_id),
+                               json={'completed': True})
+    sync_client.simulate_delete('/tasks/{}'.format(deleted_id))
+    sync_client.simulate_delete('/lists/{}'.format(other_list_id))
+    new_list_id = create_list(sync_client, 'After')
+
+    changes = sync(sync_client, cursor)
+    # The first list changed along with its tasks.
+    assert [item['id'] for item in changes['lists']] == [
+        list_id, new_list_id]
+    assert [task['id'] for task in changes['tasks']] == [updated_id]
+    assert changes['tasks'][0]['completed'] is True
+    assert kept_id not in {task['id'] for task in changes['tasks']}
+    assert changes['deleted'] == {
+        'lists': [other_list_id], 'tasks': [deleted_id]}
+    assert changes['cursor'] != cursor
+
+
+def test_changes_within_lag_returned_again(client: Client):
+    cursor = sync(client)['cursor']
+    list_id = create_list(client, 'Recent')
+    first = sync(client, cursor)
+    assert list_id in {item['id'] for item in first['lists']}
+    second = sync(client, first['cursor'])
+    assert list_id in {item['id'] for item in second['lists']}
+
+
+def test_malformed_cursor(client: Client):
+    result = client.simulate_get('/changes', params={'since': 'nope'})
+    assert result.status_code == 400
+
+
+def test_sync_pages(sync_client: Client):
+    cursor = sync(sync_client)['cursor']
+    list_ids = [create_list(sync_client, title) for title in 'ABC']
+    task_ids = [create_task(sync_client, list_ids[0], title)
+                for title in 'DE']
+    sync_client.simulate_delete('/lists/{}'.format(list_ids[2]))
+    # Tasks touched the first list after the second one was created.
+    expected = [('lists', list_ids[1]), ('lists', list_ids[0]),
+                ('tasks', task_ids[0]), ('tasks', task_ids[1]),
+                ('deleted', list_ids[2])]
+    received = []
+    pages = 0
+    more = True
+    while more:
+        changes = sync(sync_client, cursor, limit=2)
+        received.extend(('lists', item['id']) for item in changes['lists'])
+        received.extend(('tasks', task['id']) for task in changes['tasks'])
+        received.extend(('deleted', id) for id in changes['deleted']['lists'])
+        assert len(changes['lists'] + changes['tasks']) <= 2
+        cursor, more = changes['cursor'], changes['more']
+        pages += 1
+    assert received == expected
+    assert pages == 3
+    # The next sync starts after the paged one.
+    changes = sync(sync_client, cursor)
+    assert changes['lists'] == changes['tasks'] == []
+    assert changes['deleted'] == {'lists': [], 'tasks': []}
+    assert changes['more'] is False
+
+
+def test_full_sync_pages(sync_client: Client):
+    list_id = create_list(sync_client, 'Full')
+    task_ids = [create_task(sync_client, list_id, title) for title in 'AB']
+    changes = {'more': True}
+    list_ids, received_ids = [], []
+    while changes['more']:
+        changes = sync(sync_client, changes.get('cursor'), limit=2)
+        assert len(changes['lists'] + changes['tasks']) <= 2
+        list_ids.extend(item['id'] for item in changes['lists'])
+        received_ids.extend(task['id'] for task in changes['tasks'])
+    assert list_ids[-1] == list_id
+    assert received_ids[-2:] == task_ids
+    assert len(set(received_ids)) == len(received_ids)
+
+
+def test_expired_cursor(client: Client):
+    cursor = encode_cursor([datetime(2000, 1, 1), None, 0, None])
+    result = client.simulate_get('/changes', params={'since': cursor})
+    assert result.status_code == 410
+
+
+def test_old_deletions_pruned(monkeypatch, client: Client, session):
+    list_id = create_list(client, 'Pruned')
+    first_id = create_task(client, list_id, 'First')
+    second_id = create_task(client, list_id, 'Second')
+    client.simulate_delete('/tasks/{}'.format(first_id))
+    monkeypatch.setattr('settings.testing.CHANGES_RETENTION', 0)
+    pruning_client = Client(app.create())
+    pruning_client.simulate_delete('/tasks/{}'.format(second_id))
+    tombstones = session.query(Deletion.entity_id).all()
+    assert [row.entity_id for row in tombstones] == [second_id]
+
+
+@pytest.mark.parametrize('values', [
+    [None, None, 3, None],
+    [None, None, -1, None],
+    [None, None, 0, 'nope'],
+])
+def test_malformed_cursor_position(client: Client, values):
+    result = client.simulate_get('/changes', params={
+        'since': encode_cursor(values)})
+    assert result.status_code == 400
@@ -0,0 +1,74 @@
+"""Response compression tests."""
+
+import gzip
+import json
+
+import pytest
+from falcon.testing import TestClient as Client
+
+from middleware.compression import parse_accept_encoding
+
+
+@pytest.fixture()
+def large_list(client: Client) -> int:
+    resp = client.simulate_post('/lists', json={'title': 'Compressed'})
+    list_id = resp.json['id']
+    client.simulate_post('/tasks/bulk', json=[
+        {'title': 'Task {}'.format(i), 'list_id': list_id}
+        for i in range(100)
+    ])
+    return list_id
+
+
+def gzip_json(result):
+    return json.loads(gzip.decompress(result.content).decode('utf-8'))
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding('gzip, deflate;q=0.5, br;q=0') == {
+        'gzip': 1.0, 'deflate': 0.5, 'br': 0.0}
+
+
+def test_large_response_compressed(client: Client, large_list):
+    url = '/lists/{}'.format(large_list)
+    plain = client.simulate_get(url)
+    result = client.simulate_get(url, headers={'Accept-Encoding': 'gzip'})
+    assert result.status_code == 200
+    assert result.headers['content-encoding'] == 'gzip'
+    assert result.headers['vary'] == 'Accept-Encoding'
+    assert len(result.content) < len(plain.content)
+    assert gzip_json(result) == plain.json
+    assert result.headers['etag'] == 'W/' + plain.headers['etag']
+
+
+def test_weak_etag_revalidates(client: Client, large_list):
+    url = '/lists/{}'.format(large_list)
+    etag = client.simulate_get(
+        url, headers={'Accept-Encoding': 'gzip'}).headers['etag']
+    result = client.simulate_get(url, headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert result.status_code == 304
+
+
+def test_streamed_response_compressed(client: Client, large_list):
+    url = '/lists/{}'.format(large_list)
+    plain = client.simulate_get(url, params={'stream': 'true'})
+    result = client.simulate_get(url, params={'stream': 'true'},
+                                 headers={'Accept-Encoding': 'gzip'})
+    assert result.headers['content-encoding'] == 'gzip'
+    assert gzip_json(result) == plain.json
+
+
+def test_small_response_not_compressed(client: Client):
+    result = client.simulate_get('/lists/123456',
+                                 headers={'Accept-Encoding': 'gzip'})
+    assert 'content-encoding' not in result.headers
+
+
+@pytest.mark.parametrize('accept_encoding', ['', 'identity', 'gzip;q=0'])
+def test_compression_not_accepted(client: Client, large_list,
+                                  accept_encoding):
+    result = client.simulate_get('/lists/{}'.format(large_list),
+                                 headers={'Accept-Encoding': accept_encoding})
+    assert 'content-encoding' not in result.headers
+    assert result.json['id'] == large_list
@@ -0,0 +1,96 @@
+"""Conditional GET tests."""
+
+from datetime import timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+
+import pytest
+from falcon.testing import TestClient as Client
+
+from models import List
+
+
+def backdate(session, list_id: int, seconds: float=60):
+    """Move the last modification of a list to the past."""
+    session.execute(
+        List.__table__.update()
+        .where(List.id == list_id)
+        .values(updated_at=List.updated_at - timedelta(seconds=seconds)))
+    session.commit()
+
+
+@pytest.fixture()
+def url(client: Client, session, list_title):
+    """Create a list modified a minute ago and return its URL."""
+    result = client.simulate_post('/lists', json={'title': list_title})
+    backdate(session, result.json['id'])
+    return '/lists/{}'.format(result.json['id'])
+
+
+def test_list_detail_etag(client: Client, url):
+    result = client.simulate_get(url)
+    etag = result.headers['etag']
+    assert result.headers['last-modified']
+
+    result = client.simulate_get(url, headers={'If-None-Match': etag})
+    assert result.status_code == 304
+    assert result.headers['etag'] == etag
+    assert not result.content
+
+
+def test_list_detail_etag_changes_on_task_writes(client: Client, url,
+                                                 task_payload):
+    etags = [client.simulate_get(url).headers['etag']]
+    payload = {**task_payload, 'list_id': int(url.rsplit('/', 1)[1])}
+    task = client.simulate_post('/tasks', json=payload).json
+    etags.append(client.simulate_get(url).headers['etag'])
+    client.simulate_patch('/tasks/{}'.format(task['id']),
+                          json={'completed': True})
+    etags.append(client.simulate_get(url).headers['etag'])
+    client.simulate_delete('/tasks/{}'.format(task['id']))
+    etags.append(client.simulate_get(url).headers['etag'])
+    assert len(set(etags)) == 4
+
+    result = client.simulate_get(url, headers={'If-None-Match': etags[0]})
+    assert result.status_code == 200
+    assert result.json['tasks'] == []
+
+
+def test_list_detail_if_modified_since(client: Client, url):
+    last_modified = client.simulate_get(url).headers['last-modified']
+
+    result = client.simulate_get(
+        url, headers={'If-Modified-Since': last_modified})
+    assert result.status_code == 304
+
+    later = parsedate_to_datetime(last_modified) + timedelta(seconds=1)
+    later = format_datetime(later, usegmt=True)
+    result = client.simulate_get(url, headers={'If-Modified-Since': later})
+    assert result.status_code == 304
+
+    result = client.simulate_get(
+        url, headers={'If-Modified-Since': 'Sat, 01 Jan 2000 00:00:00 GMT'})
+    assert result.status_code == 200
+
+
+def test_list_detail_modified_since_last_modified(client: Client, url,
+                                                  task_payload):
+    last_modified = client.simulate_get(url).headers['last-modified']
+    payload = {**task_payload, 'list_id': int(url.rsplit('/', 1)[1])}
+    client.simulate_post('/tasks', json=payload)
+    result = client.simulate_get(
+        url, headers={'If-Modified-Since': last_modified})
+    assert result.status_code == 200
+    assert len(result.json['tasks']) == 1
+    # Modified less than a second ago: the date could not tell later
+    # changes of the same second apart.
+    assert 'last-modified' not in result.headers
+
+
+def test_list_detail_etag_takes_precedence(client: Client, url):
+    result = client.simulate_get(url)
+    headers = {
+        'If-None-Match': '"stale"',
+        'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT',
+    }
+    result = client.simulate_get(url, headers=headers)
+    assert result.status_code == 200
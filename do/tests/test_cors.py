@@ -0,0 +1,63 @@
+"""CORS tests."""
+
+from falcon.testing import TestClient as Client
+
+from middleware.cors import CORS
+
+ORIGIN = 'http://example.com'
+
+
+def preflight(client: Client, path='/tasks/1', method='PATCH'):
+    return client.simulate_options(path, headers={
+        'Origin': ORIGIN,
+        'Access-Control-Request-Method': method,
+        'Access-Control-Request-Headers': 'Content-Type',
+    })
+
+
+def test_preflight_answered_by_middleware(client: Client, settings):
+    result = preflight(client)
+    assert result.status_code == 204
+    assert result.headers['access-control-allow-origin'] == ORIGIN
+    assert result.headers['access-control-allow-methods'] == 'PATCH'
+    assert result.headers['access-control-allow-headers'] == 'Content-Type'
+    assert (result.headers['access-control-max-age']
+            == str(settings.CORS_MAX_AGE))
+    assert result.text == ''
+
+
+def test_preflight_skips_routing(client: Client):
+    # Resources are not called: not even the router runs.
+    assert preflight(client, path='/nowhere').status_code == 204
+
+
+def test_simple_request_headers(client: Client):
+    result = client.simulate_get('/lists', headers={'Origin': ORIGIN})
+    assert result.status_code == 200
+    assert result.headers['access-control-allow-origin'] == ORIGIN
+    assert 'X-Next-Cursor' in result.headers['access-control-expose-headers']
+    assert 'access-control-max-age' not in result.headers
+
+
+def test_options_without_preflight_headers_is_routed(client: Client):
+    assert client.simulate_options('/nowhere').status_code == 404
+
+
+def test_restricted_cors():
+    cors = CORS(allowed_origins=[ORIGIN], allowed_methods=['get'],
+                allowed_headers=['Content-Type'])
+    assert cors.allowed_methods == {'GET'}
+    assert cors.allowed_headers == {'content-type'}
+    assert not cors.allow_all_origins
+    assert cors.max_age is None
+
+
+def test_read_primary_header_allowed(client: Client):
+    result = client.simulate_options('/lists', headers={
+        'Origin': ORIGIN,
+        'Access-Control-Request-Method': 'GET',
+        'Access-Control-Request-Headers': 'X-Read-Primary-Until',
+    })
+    assert result.status_code == 204
+    assert (result.headers['access-control-allow-headers']
+            == 'X-Read-Primary-Until')
@@ -0,0 +1,47 @@
+"""Date-time parsing tests."""
+
+from datetime import datetime, timedelta, timezone
+
+import dateutil.parser
+import pytest
+
+from utils import parse_datetime
+
+
+@pytest.mark.parametrize('value', [
+    '2018-04-03',
+    '2018-04-03 23:47',
+    '2018-04-03 23:47:25',
+    '2018-04-03 23:47:25.525349',
+    '2018-04-03T23:47:25.525349',
+    '2018-04-03T23:47:25.5',
+    '2018-04-03T23:47:25.1234567',
+    '2018-04-03T23:47:25Z',
+    '2018-04-03T23:47:25.525349+02:00',
+    '2018-04-03T23:47:25-0530',
+    '2018-04-03T23:47:25+01',
+    # Non-ISO formats, parsed by dateutil
+    'April 3 2018 11:47 PM',
+    '03/04/2018',
+])
+def test_parse_datetime_like_dateutil(value):
+    assert parse_datetime(value) == dateutil.parser.parse(value)
+
+
+@pytest.mark.parametrize('dt', [
+    datetime(2018, 4, 3, 23, 47, 25, 525349),
+    datetime(2018, 4, 3, 23, 47),
+    datetime(2018, 4, 3, 23, 47, 25, 1, tzinfo=timezone.utc),
+    datetime(2018, 4, 3, tzinfo=timezone(-timedelta(hours=3, minutes=30))),
+])
+def test_parse_serialized_datetime(dt):
+    assert parse_datetime(str(dt)) == dt
+    assert parse_datetime(dt.isoformat()) == dt
+
+
+@pytest.mark.parametrize('value', [
+    '2018-13-03', '2018-04-03 25:00', 'not a date', '', None, 20180403,
+])
+def test_parse_invalid_datetime(value):
+    with pytest.raises(ValueError):
+        parse_datetime(value)
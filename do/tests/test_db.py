@@ -0,0 +1,23 @@
+"""Database helpers tests."""
+
+from helpers.db import get_session_factory, get_autocommit_session_factory
+
+
+def test_session_factory_options(settings, database):
+    factory = get_session_factory(settings.DATABASE_BACKEND.url,
+                                  expire_on_commit=False)
+    assert factory.kw['expire_on_commit'] is False
+
+
+def test_autocommit_session_factory(settings, database):
+    factory = get_session_factory(settings.DATABASE_BACKEND.url)
+    autocommit_factory = get_autocommit_session_factory(factory)
+
+    session = factory()
+    assert not session.connection().connection.autocommit
+    session.close()
+
+    session = autocommit_factory()
+    assert session.execute('SELECT 1').scalar() == 1
+    assert session.connection().connection.autocommit
+    session.close()
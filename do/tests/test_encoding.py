@@ -0,0 +1,44 @@
+"""JSON encoding tests."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from helpers.encoding import ENCODER_NAMES, get_json_encoder
+
+
+def installed_encoders():
+    for name in ENCODER_NAMES:
+        try:
+            yield name, get_json_encoder(name)
+        except ImportError:
+            pass
+
+
+@pytest.mark.parametrize('name, dumps', list(installed_encoders()))
+def test_encoder(name, dumps, now):
+    payload = {'title': 'Café', 'due_date': now, 'tasks': [1, None, True]}
+    encoded = dumps(payload)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded.decode('utf-8')) == {
+        **payload, 'due_date': now.isoformat(),
+    }
+
+
+@pytest.mark.parametrize('name, dumps', list(installed_encoders()))
+@pytest.mark.parametrize('value', [
+    datetime(2018, 4, 3, 12, 30), datetime(2018, 4, 3, 12, 30, 0, 1500),
+])
+def test_encoder_datetime_format(name, dumps, value):
+    # The same format with all encoders, that of orjson.
+    assert dumps([value]) == '["{}"]'.format(value.isoformat()).encode()
+
+
+def test_auto_encoder():
+    assert get_json_encoder('auto')({'id': 1}) == b'{"id":1}'
+
+
+def test_unknown_encoder():
+    with pytest.raises(ValueError):
+        get_json_encoder('pickle')
@@ -0,0 +1,171 @@
+"""List events tests."""
+
+import json
+from datetime import datetime
+
+import pytest
+from falcon.testing import TestClient as Client, StartResponseMock
+from falcon.testing import create_environ
+
+from do import app
+from helpers.db import get_session_factory
+from helpers.encoding import get_json_encoder
+from helpers.events import (Broker, PostgresBroker, TooManySubscribers,
+                            stream_events)
+
+
+def test_broker():
+    broker = Broker()
+    subscription = broker.subscribe(1)
+    other = broker.subscribe(2)
+    broker.publish(1, {'type': 'task.created'})
+    assert subscription.get(timeout=0) == {'type': 'task.created'}
+    assert other.get(timeout=0) is None
+    assert broker.stats() == {'channels': 2, 'subscribers': 2}
+    subscription.close()
+    other.close()
+    assert broker.stats() == {'channels': 0, 'subscribers': 0}
+
+
+def test_broker_max_subscribers():
+    broker = Broker(max_subscribers=2)
+    subscriptions = [broker.subscribe(1), broker.subscribe(2)]
+    with pytest.raises(TooManySubscribers):
+        broker.subscribe(1)
+    subscriptions.pop().close()
+    subscriptions.append(broker.subscribe(1))
+    assert broker.stats() == {'channels': 1, 'subscribers': 2}
+
+
+def test_slow_subscriber_drops_events():
+    broker = Broker()
+    subscription = broker.subscribe(1)
+    broker.publish_many([(1, {'n': n}) for n in range(150)])
+    assert subscription.dropped == 50
+    assert subscription.get(timeout=0) == {'n': 0}
+
+
+def test_stream_events():
+    broker = Broker()
+    subscription = broker.subscribe(1)
+    stream = stream_events(subscription, get_json_encoder('json'),
+                           keepalive=0)
+    assert next(stream) == b': subscribed\n\n'
+    assert next(stream) == b': keepalive\n\n'
+    broker.publish(1, {'type': 'task.deleted', 'task': {'id': 2}})
+    assert next(stream) == (b'event: task.deleted\n'
+                            b'data: {"task":{"id":2}}\n\n')
+    stream.close()
+    assert broker.stats()['subscribers'] == 0
+
+
+def test_stream_events_end_on():
+    broker = Broker()
+    subscription = broker.subscribe(1)
+    stream = stream_events(subscription, get_json_encoder('json'),
+                           keepalive=0, end_on=('list.deleted',))
+    next(stream)
+    broker.publish(1, {'type': 'list.deleted', 'list': {'id': 1}})
+    assert next(stream) == (b'event: list.deleted\n'
+                            b'data: {"list":{"id":1}}\n\n')
+    with pytest.raises(StopIteration):
+        next(stream)
+    assert broker.stats()['subscribers'] == 0
+
+
+def test_postgres_broker(settings, database):
+    engine = get_session_factory(settings.DATABASE_BACKEND.url).kw['bind']
+    # Brokers of two worker processes.
+    subscriber, publisher = PostgresBroker(engine), PostgresBroker(engine)
+    subscription = subscriber.subscribe(1)
+    try:
+        due_date = datetime(2018, 4, 3, 12, 30)
+        publisher.publish(1, {'type': 'task.created',
+                              'task': {'id': 3, 'due_date': due_date}})
+        assert subscription.get(timeout=5) == {
+            'type': 'task.created',
+            'task': {'id': 3, 'due_date': due_date.isoformat()}}
+    finally:
+        subscription.close()
+        subscriber.stop()
+
+
+def parse_event(chunk: bytes) -> tuple:
+    name, data = chunk.decode('utf-8').strip().split('\n')
+    return name[len('event: '):], json.loads(data[len('data: '):])
+
+
+def test_list_events(settings, database):
+    api = app.create()
+    client = Client(api)
+    list_id = client.simulate_post('/lists', json={'title': 'Live'}).json['id']
+
+    start_response = StartResponseMock()
+    stream = api(create_environ('/lists/{}/events'.format(list_id)),
+                 start_response)
+    assert start_response.status == '200 OK'
+    assert start_response.headers_dict['content-type'] == 'text/event-stream'
+    assert next(stream) == b': subscribed\n\n'
+
+    task = client.simulate_post('/tasks/', json={
+        'title': 'Live task', 'list_id': list_id}).json
+    assert parse_event(next(stream)) == ('task.created', {'task': task})
+
+    url = '/tasks/{}'.format(task['id'])
+    task = client.simulate_patch(url, json={'completed': True}).json
+    assert parse_event(next(stream)) == ('task.updated', {'task': task})
+
+    client.simulate_delete(url)
+    assert parse_event(next(stream)) == ('task.deleted', {
+        'task': {'id': task['id'], 'list_id': list_id}})
+
+    stream.close()
+    status = client.simulate_get('/status').json
+    assert status['events']['subscribers'] == 0
+
+
+def test_list_events_not_found(client: Client):
+    assert client.simulate_get('/lists/123456/events').status_code == 404
+
+
+def test_list_events_end_on_list_deletion(settings, database):
+    api = app.create()
+    client = Client(api)
+    list_id = client.simulate_post('/lists', json={'title': 'Gone'}).json['id']
+    stream = api(create_environ('/lists/{}/events'.format(list_id)),
+                 StartResponseMock())
+    assert next(stream) == b': subscribed\n\n'
+
+    client.simulate_delete('/lists/{}'.format(list_id))
+    assert parse_event(next(stream)) == ('list.deleted', {
+        'list': {'id': list_id}})
+    with pytest.raises(StopIteration):
+        next(stream)
+    stream.close()
+    status = client.simulate_get('/status').json
+    assert status['events']['subscribers'] == 0
+
+
+def test_list_events_max_streams(monkeypatch, settings, database):
+    monkeypatch.setattr('settings.testing.EVENTS_MAX_STREAMS', 1)
+    api = app.create()
+    client = Client(api)
+    list_id = client.simulate_post('/lists', json={'title': 'Busy'}).json['id']
+    url = '/lists/{}/events'.format(list_id)
+    stream = api(create_environ(url), StartResponseMock())
+    assert next(stream) == b': subscribed\n\n'
+    assert client.simulate_get(url).status_code == 503
+    # Not found lists do not hold a stream either.
+    stream.close()
+    assert client.simulate_get('/lists/123456/events').status_code == 404
+    status = client.simulate_get('/status').json
+    assert status['events']['subscribers'] == 0
+
+
+def test_list_events_sync_workers(monkeypatch, settings, database):
+    # The default for sync workers, see `settings.default._max_streams()`.
+    monkeypatch.setattr('settings.testing.EVENTS_MAX_STREAMS', 0)
+    client = Client(app.create())
+    list_id = client.simulate_post('/lists', json={'title': 'Sync'}).json['id']
+    result = client.simulate_get('/lists/{}/events'.format(list_id))
+    assert result.status_code == 503
@@ -0,0 +1,33 @@
+"""Cooperative database access tests."""
+
+import time
+
+import psycopg2
+import pytest
+from psycopg2 import extensions
+
+from helpers.green import make_psycopg2_green
+
+gevent = pytest.importorskip('gevent')
+
+
+@pytest.fixture()
+def green():
+    make_psycopg2_green()
+    yield
+    extensions.set_wait_callback(None)
+
+
+def test_queries_wait_concurrently(settings, database, green):
+    def sleep():
+        connection = psycopg2.connect(str(settings.DATABASE_BACKEND.url))
+        try:
+            connection.cursor().execute('SELECT pg_sleep(0.2)')
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    greenlets = [gevent.spawn(sleep) for _ in range(5)]
+    gevent.joinall(greenlets, raise_error=True)
+    # Sequential waits would take at least 1 second.
+    assert time.perf_counter() - start < 0.8
@@ -0,0 +1,52 @@
+"""JSON request body tests."""
+
+import threading
+
+import falcon
+import pytest
+from falcon.testing import TestClient as Client
+
+from middleware.jsonify import JSONBodyMiddleware
+
+
+class EchoResource:
+    """Return the title of the payload, once all requests are parsed."""
+
+    def __init__(self, parties: int):
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def on_post(self, request, response):
+        self.barrier.wait()
+        response.media = {'title': request.get_json('title', dtype=str)}
+
+
+def test_concurrent_requests_read_their_own_body():
+    n_requests = 4
+    api = falcon.API(middleware=[JSONBodyMiddleware()])
+    api.add_route('/echo', EchoResource(parties=n_requests))
+    client = Client(api)
+    titles = {}
+
+    def post(title):
+        result = client.simulate_post('/echo', json={'title': title})
+        titles[title] = result.json['title']
+
+    threads = [threading.Thread(target=post, args=(str(i),))
+               for i in range(n_requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert titles == {str(i): str(i) for i in range(n_requests)}
+
+
+@pytest.mark.parametrize('payload, status', [
+    ({'title': 'Shopping'}, 200),
+    ({'title': 1}, 400),
+    ({}, 400),
+])
+def test_get_json_validates_fields(payload, status):
+    api = falcon.API(middleware=[JSONBodyMiddleware()])
+    api.add_route('/echo', EchoResource(parties=1))
+    result = Client(api).simulate_post('/echo', json=payload)
+    assert result.status_code == status
@@ -0,0 +1,97 @@
+"""Access logging tests."""
+
+import json
+import logging
+
+import falcon
+import pytest
+from falcon.testing import TestClient as Client
+
+from middleware.logging import (ResponseLoggerMiddleware, JSONFormatter,
+                                enqueue_handlers, stop_listeners)
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+@pytest.fixture()
+def handler():
+    """Return a handler keeping the lines it outputs."""
+    return ListHandler()
+
+
+@pytest.fixture()
+def logger(request, handler):
+    """Return a logger outputting to `handler`, among other handlers."""
+    logger = logging.getLogger('test_logging.' + request.node.name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    # Like the log capture handlers that pytest may add.
+    logger.addHandler(logging.NullHandler())
+    logger.addHandler(handler)
+    yield logger
+    for logger_handler in list(logger.handlers):
+        logger.removeHandler(logger_handler)
+
+
+class ItemResource:
+
+    def on_get(self, request, response, id):
+        if id != 1:
+            raise falcon.HTTPNotFound()
+
+
+def create_client(logger, **options) -> Client:
+    api = falcon.API(middleware=[
+        ResponseLoggerMiddleware(logger=logger, **options)])
+    api.add_route('/items/{id:int}', ItemResource())
+    return Client(api)
+
+
+def test_text_format(logger, handler):
+    create_client(logger).simulate_get('/items/1', params={'limit': 5})
+    [line] = handler.lines
+    assert line.startswith('http GET /items/1?limit=5 200 ')
+    assert line.endswith('ms')
+
+
+def test_structured_format(logger, handler):
+    create_client(logger, structured=True).simulate_get(
+        '/items/1', params={'limit': 5})
+    [line] = handler.lines
+    entry = json.loads(line)
+    assert entry['message'] == 'access'
+    assert entry['level'] == 'INFO'
+    assert entry['method'] == 'GET'
+    assert entry['path'] == '/items/1'
+    assert entry['query'] == 'limit=5'
+    assert entry['status'] == 200
+    assert entry['latency_ms'] >= 0
+    assert 'time' in entry
+
+
+def test_sampling_keeps_errors(logger, handler):
+    client = create_client(logger, structured=True, sample_rate=0)
+    client.simulate_get('/items/1')
+    client.simulate_get('/items/2')
+    [line] = handler.lines
+    assert json.loads(line)['status'] == 404
+
+
+def test_queued_handlers(logger, handler):
+    handler.setFormatter(JSONFormatter())
+    listener = enqueue_handlers(logger)
+    assert enqueue_handlers(logger) is listener
+    assert handler not in logger.handlers
+    assert handler in listener.handlers
+    logger.info('access', extra={'access': {'status': 200}})
+    stop_listeners()
+    [line] = handler.lines
+    assert json.loads(line)['status'] == 200
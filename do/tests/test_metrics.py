@@ -0,0 +1,87 @@
+"""Metrics tests."""
+
+import pytest
+from falcon.testing import TestClient as Client
+from sqlalchemy.exc import ProgrammingError
+
+from helpers.db import get_session_factory
+from helpers.metrics import Histogram, RequestMetrics
+
+
+def _samples(text: str) -> dict:
+    return dict(line.rsplit(' ', 1) for line in text.splitlines()
+                if not line.startswith('#'))
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 5, 10))
+    for value in (0.5, 1, 3, 7, 20):
+        histogram.observe(value)
+    assert list(histogram.cumulative_counts()) == [(1, 2), (5, 3), (10, 4)]
+    assert histogram.count == 5
+    assert histogram.sum == 31.5
+
+
+def test_statements_attributed_to_current_request():
+    metrics = RequestMetrics()
+    metrics.record_statement(0.5)
+    metrics.start_request()
+    metrics.record_statement(0.25)
+    metrics.record_statement(0.25)
+    metrics.finish_request('GET', '/lists', '200', 1.0)
+    samples = _samples(metrics.render())
+    labels = '{method="GET",route="/lists"}'
+    assert float(samples['do_request_db_statements_sum' + labels]) == 2
+    assert float(samples['do_request_db_duration_seconds_sum' + labels]) == .5
+    assert float(samples['do_request_duration_seconds_sum' + labels]) == 1
+    assert samples['do_db_statements_total'] == '3'
+
+
+def test_metrics_endpoint(client: Client):
+    client.simulate_get('/lists/1')
+    client.simulate_get('/lists')
+    client.simulate_get('/lists')
+    client.simulate_get('/nowhere')
+    result = client.simulate_get('/metrics')
+    assert result.status_code == 200
+    assert result.headers['content-type'].startswith('text/plain')
+    samples = _samples(result.text)
+    assert samples[
+        'do_requests_total{method="GET",route="/lists",status="200"}'] == '2'
+    assert samples[
+        'do_requests_total{method="GET",route="/lists/{id:int}",'
+        'status="404"}'] == '1'
+    assert samples[
+        'do_requests_total{method="GET",route="unmatched",'
+        'status="404"}'] == '1'
+    labels = '{method="GET",route="/lists"}'
+    assert samples['do_request_duration_seconds_count' + labels] == '2'
+    assert samples[
+        'do_request_duration_seconds_bucket{method="GET",route="/lists",'
+        'le="+Inf"}'] == '2'
+    assert float(samples['do_request_db_statements_sum' + labels]) >= 1
+    assert float(samples['do_request_db_duration_seconds_sum' + labels]) > 0
+
+
+def test_failed_statements_are_timed(settings, database):
+    engine = get_session_factory(settings.DATABASE_BACKEND.url).kw['bind']
+    metrics = RequestMetrics()
+    metrics.instrument(engine)
+    with engine.connect() as connection:
+        with pytest.raises(ProgrammingError):
+            connection.execute('SELECT * FROM nowhere')
+        assert connection.info['metrics_start'] == []
+        connection.execute('SELECT 1')
+        assert connection.info['metrics_start'] == []
+    assert metrics.statements_total == 2
+
+
+def test_streamed_statements_attributed_to_request(client: Client):
+    client.simulate_post('/lists', json={'title': 'Streamed'})
+    result = client.simulate_get('/lists', params={'stream': 'true'})
+    assert result.status_code == 200
+    samples = _samples(client.simulate_get('/metrics').text)
+    labels = '{method="GET",route="/lists"}'
+    # The list rows are fetched while the body is streamed.
+    assert float(samples['do_request_db_statements_sum' + labels]) >= 1
+    assert samples['do_request_duration_seconds_count' + labels] == '1'
@@ -0,0 +1,149 @@
+"""Keyset pagination tests."""
+
+import pytest
+from falcon.testing import TestClient as Client
+
+from helpers.pagination import NEXT_CURSOR_HEADER, encode_cursor
+
+
+def browse(client: Client, url: str, limit: int, **params) -> list:
+    """Follow next cursors and return the pages of items."""
+    pages = []
+    params['limit'] = limit
+    while True:
+        result = client.simulate_get(url, params=params)
+        assert result.status_code == 200, result.json
+        pages.append(result.json)
+        cursor = result.headers.get(NEXT_CURSOR_HEADER.lower())
+        if cursor is None:
+            return pages
+        params['after'] = cursor
+
+
+@pytest.fixture()
+def list_id(client: Client, list_title, task_payload):
+    """Create a list with 5 tasks and return its ID."""
+    result = client.simulate_post('/lists', json={'title': list_title})
+    list_id = result.json['id']
+    for _ in range(5):
+        client.simulate_post('/tasks', json={**task_payload,
+                                             'list_id': list_id})
+    return list_id
+
+
+def test_paginate_lists(client: Client, list_id):
+    pages = browse(client, '/lists', limit=2)
+    assert all(len(page) <= 2 for page in pages)
+    ids = [list_['id'] for page in pages for list_ in page]
+    assert ids == sorted(set(ids))
+    assert list_id in ids
+
+
+def test_paginate_list_tasks(client: Client, list_id):
+    pages = browse(client, '/lists/{}/tasks'.format(list_id), limit=2)
+    assert [len(page) for page in pages] == [2, 2, 1]
+    tasks = [task for page in pages for task in page]
+    assert all(task['list_id'] == list_id for task in tasks)
+    ids = [task['id'] for task in tasks]
+    assert ids == sorted(set(ids))
+
+
+@pytest.mark.parametrize('params', [
+    {'limit': 0}, {'limit': 'abc'}, {'after': 'not-a-cursor'},
+])
+def test_paginate_invalid_params(client: Client, params):
+    result = client.simulate_get('/lists', params=params)
+    assert result.status_code == 400
+
+
+@pytest.mark.parametrize('url, values', [
+    ('/lists', ['abc']),
+    ('/lists', [{'a': 1}]),
+    ('/lists', [[1]]),
+    ('/lists', [True]),
+    ('/lists', [1.5]),
+    ('/lists', [None]),
+    ('/lists/1/tasks', ['abc']),
+    ('/lists/stats', [[1]]),
+    ('/agenda', [1, 2]),
+    ('/agenda', ['2018-04-03T12:00:00', 'abc']),
+])
+def test_paginate_cursor_wrong_types(client: Client, url, values):
+    # Well-formed cursors carrying values of the wrong type.
+    result = client.simulate_get(url, params={'after': encode_cursor(values)})
+    assert result.status_code == 400
+
+
+@pytest.mark.parametrize('order, values', [
+    ('priority', ['1', 2]),
+    ('priority', [None, 2]),
+    ('due_date', [1, 2]),
+    ('due_date', ['not a date', 2]),
+    ('id', [True]),
+])
+def test_list_tasks_cursor_wrong_types(client: Client, tasks_url, order,
+                                       values):
+    params = {'order': order, 'after': encode_cursor(values)}
+    result = client.simulate_get(tasks_url, params=params)
+    assert result.status_code == 400
+
+
+def test_list_tasks_list_not_found(client: Client):
+    result = client.simulate_get('/lists/123456789/tasks')
+    assert result.status_code == 404
+
+
+@pytest.fixture()
+def tasks_url(client: Client, list_title, task_payload, now):
+    """Create a list with tasks of various priorities and due dates."""
+    result = client.simulate_post('/lists', json={'title': list_title})
+    list_id = result.json['id']
+    payload = [
+        {**task_payload, 'list_id': list_id, 'title': str(i),
+         'priority': i % 3, 'completed': i % 2 == 0,
+         'due_date': str(now.replace(day=1, hour=i)) if i % 4 else None}
+        for i in range(1, 11)
+    ]
+    client.simulate_post('/tasks/bulk', json=payload)
+    return '/lists/{}/tasks'.format(list_id)
+
+
+def sort_key(order):
+    if order == 'priority':
+        return lambda task: (-task['priority'], task['id'])
+    if order == 'due_date':
+        return lambda task: (task['due_date'] is None, task['due_date'] or '',
+                             task['id'])
+    return lambda task: task['id']
+
+
+@pytest.mark.parametrize('order', ['id', 'priority', 'due_date'])
+@pytest.mark.parametrize('filters', [
+    {}, {'completed': 'true'}, {'completed': 'false'},
+])
+def test_paginate_list_tasks_ordered(client: Client, tasks_url, order,
+                                     filters):
+    all_tasks = client.simulate_get(tasks_url).json
+    expected = sorted(all_tasks, key=sort_key(order))
+    if filters:
+        completed = filters['completed'] == 'true'
+        expected = [task for task in expected
+                    if task['completed'] == completed]
+
+    pages = browse(client, tasks_url, limit=3, order=order, **filters)
+    assert [task for page in pages for task in page] == expected
+
+
+def test_list_tasks_due_before(client: Client, tasks_url, now):
+    due_before = str(now.replace(day=1, hour=5))
+    result = client.simulate_get(tasks_url, params={'due_before': due_before})
+    assert result.status_code == 200
+    assert sorted(task['title'] for task in result.json) == ['1', '2', '3']
+
+
+@pytest.mark.parametrize('params', [
+    {'order': 'title'}, {'completed': 'maybe'}, {'due_before': 'not a date'},
+])
+def test_list_tasks_bad_request(client: Client, tasks_url, params):
+    result = client.simulate_get(tasks_url, params=params)
+    assert result.status_code == 400
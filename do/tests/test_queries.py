@@ -0,0 +1,32 @@
+"""Serialized data loaders tests."""
+
+import falcon
+import pytest
+from falcon.testing import TestClient as Client
+
+from queries import LIST_DETAIL_LOADERS, load_list_detail
+
+
+@pytest.fixture()
+def list_id(client: Client, list_title, task_payload):
+    """Create a list with a few tasks and return its ID."""
+    result = client.simulate_post('/lists', json={'title': list_title})
+    list_id = result.json['id']
+    for priority in range(3):
+        payload = {**task_payload, 'list_id': list_id, 'priority': priority}
+        client.simulate_post('/tasks', json=payload)
+    return list_id
+
+
+def test_list_detail_loaders_agree(session, list_id):
+    orm, projection = (LIST_DETAIL_LOADERS[name](session, list_id)
+                       for name in ('orm', 'projection'))
+    assert len(projection['tasks']) == 3
+    assert projection == {
+        **orm, 'tasks': sorted(orm['tasks'], key=lambda task: task['id']),
+    }
+
+
+def test_list_detail_loader_not_found(session):
+    with pytest.raises(falcon.HTTPNotFound):
+        load_list_detail(session, 123456789)
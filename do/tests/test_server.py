@@ -0,0 +1,61 @@
+"""Application server configuration tests."""
+
+import pytest
+
+from helpers.server import get_gunicorn_args, get_worker_count
+
+
+def option(args: list, name: str) -> str:
+    return args[args.index(name) + 1]
+
+
+def test_dev_profile(settings, monkeypatch):
+    monkeypatch.setattr(settings, 'SERVER_WORKER_CLASS', 'gthread')
+    args = get_gunicorn_args(settings, profile='dev')
+    assert '--reload' in args
+    assert '--preload' not in args
+    assert '--workers' not in args
+    assert option(args, '--bind') == settings.SERVER_BIND
+    # Not a sync worker, whose only thread an event stream would hold.
+    assert option(args, '--worker-class') == 'gthread'
+    assert option(args, '--threads') == str(settings.SERVER_THREADS)
+
+
+@pytest.mark.parametrize('worker_class, workers', [
+    ('sync', 9), ('gthread', 9), ('gevent', 4),
+])
+def test_worker_count(worker_class, workers):
+    assert get_worker_count(worker_class, cpu_count=4) == workers
+
+
+def test_prod_profile(settings, monkeypatch):
+    monkeypatch.setattr(settings, 'SERVER_WORKERS', 3)
+    monkeypatch.setattr(settings, 'SERVER_WORKER_CLASS', 'gthread')
+    monkeypatch.setattr(settings, 'SERVER_PRELOAD', True)
+    args = get_gunicorn_args(settings, profile='prod')
+    assert '--reload' not in args
+    assert '--preload' in args
+    assert option(args, '--config') == 'python:helpers.server'
+    assert option(args, '--workers') == '3'
+    assert option(args, '--worker-class') == 'gthread'
+    assert option(args, '--threads') == str(settings.SERVER_THREADS)
+    assert option(args, '--keep-alive') == str(settings.SERVER_KEEPALIVE)
+    assert option(args, '--backlog') == str(settings.SERVER_BACKLOG)
+
+
+@pytest.mark.parametrize('preload', [True, False])
+def test_prod_profile_gevent(settings, monkeypatch, preload):
+    monkeypatch.setattr(settings, 'SERVER_WORKER_CLASS', 'gevent')
+    monkeypatch.setattr(settings, 'SERVER_PRELOAD', preload)
+    args = get_gunicorn_args(settings, profile='prod')
+    # The app must be loaded after gevent patched the worker.
+    assert '--preload' not in args
+    assert '--threads' not in args
+    assert (option(args, '--worker-connections')
+            == str(settings.SERVER_WORKER_CONNECTIONS))
+    assert int(option(args, '--workers')) == get_worker_count('gevent')
+
+
+def test_unknown_profile(settings):
+    with pytest.raises(ValueError):
+        get_gunicorn_args(settings, profile='staging')
@@ -0,0 +1,32 @@
+"""Settings tests."""
+
+import pytest
+
+from settings.default import _env_flag, _max_streams
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('1', True), ('true', True), ('Yes', True), ('on', True),
+    ('0', False), ('false', False), ('no', False), ('off', False),
+    ('', False),
+])
+def test_env_flag(monkeypatch, value, expected):
+    monkeypatch.setenv('DO_TEST_FLAG', value)
+    assert _env_flag('DO_TEST_FLAG', default=not expected) is expected
+
+
+@pytest.mark.parametrize('default', [True, False])
+def test_env_flag_default(monkeypatch, default):
+    monkeypatch.delenv('DO_TEST_FLAG', raising=False)
+    assert _env_flag('DO_TEST_FLAG', default=default) is default
+
+
+@pytest.mark.parametrize('worker_class, expected', [
+    ('sync', 0), ('gthread', 2), ('gevent', 50),
+])
+def test_max_streams(worker_class, expected):
+    assert _max_streams(worker_class, threads=4, connections=100) == expected
+
+
+def test_max_streams_single_thread():
+    assert _max_streams('gthread', threads=1, connections=100) == 0
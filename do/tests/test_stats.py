@@ -0,0 +1,38 @@
+"""List statistics tests."""
+
+from datetime import timedelta
+
+import pytest
+from falcon.testing import TestClient as Client
+
+
+@pytest.fixture()
+def list_ids(client: Client, list_title, task_payload, now):
+    """Create a list with tasks and an empty list, and return their IDs."""
+    list_ids = [
+        client.simulate_post('/lists', json={'title': list_title}).json['id']
+        for _ in range(2)
+    ]
+    past, future = str(now - timedelta(days=1)), str(now + timedelta(days=1))
+    payload = [
+        {**task_payload, 'list_id': list_ids[0], 'completed': completed,
+         'due_date': due_date}
+        for completed, due_date in [
+            (False, past), (False, future), (False, None),
+            (True, past), (True, None),
+        ]
+    ]
+    client.simulate_post('/tasks/bulk', json=payload)
+    return list_ids
+
+
+def test_list_stats(client: Client, list_ids):
+    result = client.simulate_get('/lists/stats')
+    assert result.status_code == 200, result.json
+    stats = {item['list_id']: item for item in result.json}
+    assert stats[list_ids[0]] == {
+        'list_id': list_ids[0], 'open': 3, 'done': 2, 'overdue': 1,
+    }
+    assert stats[list_ids[1]] == {
+        'list_id': list_ids[1], 'open': 0, 'done': 0, 'overdue': 0,
+    }
@@ -0,0 +1,31 @@
+"""Runtime statistics tests."""
+
+from falcon.testing import TestClient as Client
+
+
+def test_pool_status(client: Client):
+    client.simulate_get('/lists')
+    result = client.simulate_get('/status')
+    assert result.status_code == 200, result.json
+    pool = result.json['pool']
+    assert pool['checkouts'] >= 1
+    assert pool['checked_out'] == 0
+    assert pool['timeouts'] == 0
+    assert pool['wait_max'] >= 0
+
+
+def test_sessions_created_lazily(client: Client):
+    def stats():
+        return client.simulate_get('/status').json['sessions']
+
+    before = stats()
+    client.simulate_get('/nowhere')
+    client.simulate_get('/metrics')
+    after_no_database = stats()
+    # Requests were counted, but none of them needed a session.
+    assert after_no_database['requests'] == before['requests'] + 3
+    assert after_no_database['created'] == before['created']
+
+    client.simulate_get('/lists/123456')
+    after_database = stats()
+    assert after_database['created'] == before['created'] + 1
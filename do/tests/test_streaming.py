@@ -0,0 +1,48 @@
+"""Streamed responses tests."""
+
+import pytest
+from falcon.testing import TestClient as Client
+
+from do import app
+
+
+@pytest.fixture()
+def list_id(client: Client, list_title, task_payload):
+    """Create a list with 5 tasks and return its ID."""
+    result = client.simulate_post('/lists', json={'title': list_title})
+    list_id = result.json['id']
+    payload = [{**task_payload, 'list_id': list_id} for _ in range(5)]
+    client.simulate_post('/tasks/bulk', json=payload)
+    return list_id
+
+
+def test_stream_lists(client: Client, settings, list_id):
+    result = client.simulate_get('/lists', params={'stream': 'true'})
+    assert result.status_code == 200
+    lists = result.json
+    assert list_id in [list_['id'] for list_ in lists]
+    assert lists[:settings.PAGE_SIZE] == client.simulate_get('/lists').json
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, 500])
+def test_stream_list_detail(monkeypatch, list_id, batch_size):
+    monkeypatch.setattr('settings.testing.STREAM_BATCH_SIZE', batch_size)
+    client = Client(app.create())
+    url = '/lists/{}'.format(list_id)
+    result = client.simulate_get(url, params={'stream': 'true'})
+    assert result.status_code == 200
+    assert len(result.json['tasks']) == 5
+    assert result.json == client.simulate_get(url).json
+
+
+def test_stream_empty_list_detail(client: Client, list_title):
+    result = client.simulate_post('/lists', json={'title': list_title})
+    url = '/lists/{}'.format(result.json['id'])
+    result = client.simulate_get(url, params={'stream': 'true'})
+    assert result.json == {**result.json, 'tasks': []}
+
+
+def test_stream_list_detail_not_found(client: Client):
+    result = client.simulate_get('/lists/123456789',
+                                 params={'stream': 'true'})
+    assert result.status_code == 404
@@ -0,0 +1,60 @@
+"""Agenda tests."""
+
+from datetime import timedelta
+
+import pytest
+from falcon.testing import TestClient as Client
+
+from helpers.pagination import NEXT_CURSOR_HEADER
+
+
+@pytest.fixture()
+def task_ids(client: Client, list_title, task_payload, now):
+    """Create tasks due at various times; return IDs of the open ones."""
+    list_ids = [
+        client.simulate_post('/lists', json={'title': list_title}).json['id']
+        for _ in range(2)
+    ]
+    # Far in the future, not to clash with tasks of other tests.
+    base = now.replace(year=now.year + 50)
+    payload = [
+        {**task_payload, 'list_id': list_ids[i % 2], 'completed': i == 3,
+         'due_date': str(base + timedelta(days=9 - i))}
+        for i in range(10)
+    ]
+    tasks = client.simulate_post('/tasks/bulk', json=payload).json
+    return base, [task['id'] for task in tasks if not task['completed']]
+
+
+def test_agenda(client: Client, task_ids):
+    base, ids = task_ids
+    params = {
+        'start': str(base + timedelta(days=1)),
+        'end': str(base + timedelta(days=8)),
+        'limit': 4,
+    }
+    result = client.simulate_get('/agenda', params=params)
+    assert result.status_code == 200, result.json
+    tasks = result.json
+    params['after'] = result.headers[NEXT_CURSOR_HEADER.lower()]
+    result = client.simulate_get('/agenda', params=params)
+    tasks += result.json
+    assert NEXT_CURSOR_HEADER.lower() not in result.headers
+
+    # Tasks due in days 1..7 (i = 8..2), except the completed one (i = 3).
+    assert [task['id'] for task in tasks] == [
+        ids[i] for i in (7, 6, 5, 4, 3, 2)
+    ]
+    assert tasks == sorted(tasks, key=lambda task: task['due_date'])
+
+
+def test_agenda_default_window(client: Client, task_ids):
+    _, ids = task_ids
+    result = client.simulate_get('/agenda')
+    assert result.status_code == 200, result.json
+    assert not set(ids) & {task['id'] for task in result.json}
+
+
+def test_agenda_bad_request(client: Client):
+    result = client.simulate_get('/agenda', params={'start': 'tomorrow-ish'})
+    assert result.status_code == 400
@@ -1,7 +1,19 @@
 """Miscellaneous utilities."""
 
+import re
+from datetime import datetime, timedelta, timezone
+
+import dateutil.parser
 import falcon
 
+MISSING = object()
+
+ISO_DATETIME = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,6})\d*)?)?'
+    r'(Z|[+-]\d{2}(?::?\d{2})?)?)?$'
+)
+
 
 def remove_empty(dictionnary) -> dict:
     """Remove items whose value is None in a dictionnary."""
@@ -22,3 +34,115 @@ def get_or_404(session, model, **kwargs):
     if not obj:
         raise falcon.HTTPNotFound()
     return obj
+
+
+def get_field(data: dict, field: str, dtype=None, default=MISSING):
+    """Read a field from a JSON object, like `request.get_json()` does.
+
+    Parameters
+    ----------
+    data : dict
+    field : str
+    dtype : type, optional
+        If given, a 400 error is raised if the value is not of this type.
+    default : any, optional
+        Value returned if the field is missing. If not given, a missing
+        field raises a 400 error.
+    """
+    if field not in data:
+        if default is MISSING:
+            raise falcon.HTTPBadRequest(
+                'Missing JSON field', "Field '{}' is required".format(field))
+        return default
+    value = data[field]
+    if dtype is not None and type(value) is not dtype:
+        raise falcon.HTTPBadRequest(
+            'Validation error',
+            "Data type for '{}' is '{}' but should be '{}'".format(
+                field, type(value).__name__, dtype.__name__))
+    return value
+
+
+def get_last_modified(last_modified, now: datetime=None):
+    """Return the `Last-Modified` date of a resource, or None to send none.
+
+    HTTP dates have a resolution of one second, so a resource modified in
+    the same second as a response could change again within that second
+    without its `Last-Modified` changing. As in RFC 7232 (section 2.2.2),
+    it is only sent once the resource was modified at least one second
+    before the response.
+
+    Parameters
+    ----------
+    last_modified : datetime
+        Last modification time of the resource, in UTC.
+    now : datetime, optional
+        Time of the response, in UTC. Defaults to the current time.
+    """
+    if now is None:
+        now = datetime.utcnow()
+    if last_modified > now - timedelta(seconds=1):
+        return None
+    return last_modified
+
+
+def is_not_modified(request, etag: str, last_modified) -> bool:
+    """Evaluate the conditional headers of a GET request.
+
+    Returns True if the client's copy is up to date, i.e. if the response
+    should be a 304 Not Modified. The ETag (If-None-Match) takes precedence
+    over If-Modified-Since.
+
+    Parameters
+    ----------
+    request : falcon.Request
+    etag : str
+        Current entity tag of the resource.
+    last_modified : datetime
+        Current last modification time of the resource, in UTC.
+    """
+    if request.if_none_match is not None:
+        # If-Modified-Since is ignored when If-None-Match is present.
+        tags = [tag.strip() for tag in request.if_none_match.split(',')]
+        return '*' in tags or etag in tags or 'W/' + etag in tags
+    if request.if_modified_since is not None:
+        # Compared at the resolution of HTTP dates. The client's date comes
+        # from a `Last-Modified`, only sent for resources modified a second
+        # before the response (see `get_last_modified()`): later changes
+        # are in a later second.
+        return (last_modified.replace(microsecond=0)
+                <= request.if_modified_since)
+    return False
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse a date-time, quickly if it is in ISO 8601 format.
+
+    ISO 8601 date-times (as output by `str(datetime)` or
+    `datetime.isoformat()`) are parsed with a regular expression. Other
+    formats are left to `dateutil`, which is much slower.
+
+    Raises a ValueError if the value cannot be parsed.
+    """
+    if not isinstance(value, str):
+        raise ValueError('Expected a date-time string, got {!r}'
+                         .format(value))
+    match = ISO_DATETIME.match(value)
+    if match is None:
+        return dateutil.parser.parse(value)
+    (year, month, day, hour, minute, second,
+     fraction, offset) = match.groups()
+    tzinfo = None
+    if offset == 'Z':
+        tzinfo = timezone.utc
+    elif offset:
+        sign = -1 if offset[0] == '-' else 1
+        digits = offset[1:].replace(':', '')
+        tzinfo = timezone(sign * timedelta(hours=int(digits[:2]),
+                                           minutes=int(digits[2:] or 0)))
+    return datetime(
+        int(year), int(month), int(day),
+        int(hour or 0), int(minute or 0), int(second or 0),
+        int(fraction.ljust(6, '0')) if fraction else 0,
+        tzinfo=tzinfo,
+    )